@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ClientesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "clientes"
+
+    def ready(self):
+        """Registra o AuditLog (definido em audit.py) junto com os demais modelos"""
+        import clientes.audit  # noqa: F401
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clientes", "0004_auditlog"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cliente",
+            index=models.Index(
+                fields=["created_at"], name="clientes_cl_created_cc2563_idx"
+            ),
+        ),
+    ]
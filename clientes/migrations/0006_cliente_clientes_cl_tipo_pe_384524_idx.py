@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clientes", "0005_cliente_clientes_cl_created_cc2563_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cliente",
+            index=models.Index(
+                fields=["tipo_pessoa", "ativo"], name="clientes_cl_tipo_pe_384524_idx"
+            ),
+        ),
+    ]
@@ -181,6 +181,8 @@ class Cliente(models.Model):
             models.Index(fields=['nome_razao_social']),
             models.Index(fields=['cpf_cnpj']),
             models.Index(fields=['ativo']),
+            models.Index(fields=['created_at']),
+            models.Index(fields=['tipo_pessoa', 'ativo']),
         ]
     
     def __str__(self):
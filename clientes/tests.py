@@ -142,7 +142,7 @@ class ClienteViewTest(TestCase):
             email='test@example.com',
             password='testpass123'
         )
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Criar cliente de teste
         self.cliente = Cliente.objects.create(
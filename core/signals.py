@@ -0,0 +1,28 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from clientes.models import Cliente
+from financeiro.models import Honorario, Despesa
+from processos.models import Processo, Andamento, Prazo
+
+from .views import DASHBOARD_METRICS_CACHE_KEY
+
+
+@receiver(post_save, sender=Processo)
+@receiver(post_delete, sender=Processo)
+@receiver(post_save, sender=Andamento)
+@receiver(post_delete, sender=Andamento)
+@receiver(post_save, sender=Prazo)
+@receiver(post_delete, sender=Prazo)
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+@receiver(post_save, sender=Honorario)
+@receiver(post_delete, sender=Honorario)
+@receiver(post_save, sender=Despesa)
+@receiver(post_delete, sender=Despesa)
+def invalidar_metricas_dashboard(sender, instance, **kwargs):
+    """
+    Remove as métricas do dashboard em cache quando os dados de origem mudam
+    """
+    cache.delete(DASHBOARD_METRICS_CACHE_KEY)
@@ -2,10 +2,12 @@ from django.shortcuts import render, redirect
 from django.views.generic import TemplateView
 from django.contrib.auth.views import LoginView as DjangoLoginView, LogoutView as DjangoLogoutView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.db.models import Count, Sum, Q
 from django.utils import timezone
 from django.http import JsonResponse
 from datetime import datetime, timedelta
+from decimal import Decimal
 import json
 from processos.models import Processo, Andamento, Prazo
 from clientes.models import Cliente
@@ -13,6 +15,14 @@ from financeiro.models import Honorario, Despesa
 from usuarios.models import Usuario
 
 
+# Métricas do dashboard em cache (iguais para todos os usuários); invalidadas
+# pelos signals de core ao salvar/excluir os modelos de origem. O cache padrão
+# usa o JSONSerializer do django_redis: só entram escalares, strings JSON e
+# totais em texto, nunca instâncias de modelo
+DASHBOARD_METRICS_CACHE_KEY = 'dashboard_metrics'
+DASHBOARD_METRICS_TIMEOUT = 60
+
+
 class DashboardView(LoginRequiredMixin, TemplateView):
     """
     View principal do Dashboard com KPIs, gráficos e informações importantes
@@ -22,20 +32,48 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        metricas = cache.get(DASHBOARD_METRICS_CACHE_KEY)
+        if metricas is None:
+            metricas = self.calcular_metricas()
+            cache.set(DASHBOARD_METRICS_CACHE_KEY, metricas, DASHBOARD_METRICS_TIMEOUT)
+        context.update(metricas)
+        context['total_honorarios'] = Decimal(metricas['total_honorarios'])
+        context['total_despesas'] = Decimal(metricas['total_despesas'])
+        
+        # Listas com instâncias de modelo ficam fora do cache (consultas limitadas)
+        hoje = timezone.now().date()
+        context['prazos_criticos'] = Prazo.objects.filter(
+            data_limite__gte=hoje,
+            data_limite__lte=hoje + timedelta(days=7),
+            cumprido=False
+        ).select_related('processo').order_by('data_limite')[:10]
+        context['ultimos_andamentos'] = Andamento.objects.select_related(
+            'processo', 'usuario'
+        ).order_by('-data_andamento')[:5]
+        return context
+    
+    def calcular_metricas(self):
+        """Calcula KPIs e dados dos gráficos do dashboard em formato serializável em JSON"""
+        context = {}
         
         # Data atual para filtros
         hoje = timezone.now().date()
         inicio_mes = hoje.replace(day=1)
         fim_mes = (inicio_mes + timedelta(days=32)).replace(day=1) - timedelta(days=1)
         
-        # KPIs principais
-        context['total_processos'] = Processo.objects.count()
-        context['processos_ativos'] = Processo.objects.filter(status='ativo').count()
-        context['processos_mes'] = Processo.objects.filter(
-            data_inicio__gte=inicio_mes,
-            data_inicio__lte=fim_mes
-        ).count()
+        # KPIs principais (contadores de processos num único aggregate)
+        totais_processos = Processo.objects.aggregate(
+            total=Count('id'),
+            ativos=Count('id', filter=Q(status='ativo')),
+            arquivados=Count('id', filter=Q(status='arquivado')),
+            mes=Count('id', filter=Q(data_inicio__gte=inicio_mes, data_inicio__lte=fim_mes)),
+        )
+        context['total_processos'] = totais_processos['total']
+        context['processos_ativos'] = totais_processos['ativos']
+        context['processos_arquivados'] = totais_processos['arquivados']
+        context['processos_mes'] = totais_processos['mes']
         context['total_clientes'] = Cliente.objects.count()
+        context['andamentos_hoje'] = Andamento.objects.filter(data_andamento=hoje).count()
         
         # Processos por status para gráfico
         processos_por_status = list(
@@ -45,27 +83,14 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         )
         context['processos_por_status'] = json.dumps(processos_por_status)
         
-        # Prazos críticos (próximos 7 dias)
-        proximos_7_dias = hoje + timedelta(days=7)
-        context['prazos_criticos'] = Prazo.objects.filter(
-            data_limite__gte=hoje,
-            data_limite__lte=proximos_7_dias,
-            cumprido=False
-        ).select_related('processo').order_by('data_limite')[:10]
-        
-        # Últimos andamentos
-        context['ultimos_andamentos'] = Andamento.objects.select_related(
-            'processo', 'usuario'
-        ).order_by('-data_andamento')[:5]
-        
-        # Estatísticas financeiras
-        context['total_honorarios'] = Honorario.objects.aggregate(
+        # Estatísticas financeiras (Decimal em texto; convertidas de volta na leitura)
+        context['total_honorarios'] = str(Honorario.objects.aggregate(
             total=Sum('valor_total')
-        )['total'] or 0
+        )['total'] or 0)
         
-        context['total_despesas'] = Despesa.objects.aggregate(
+        context['total_despesas'] = str(Despesa.objects.aggregate(
             total=Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
         
         # Processos por área do direito
         processos_por_area = list(
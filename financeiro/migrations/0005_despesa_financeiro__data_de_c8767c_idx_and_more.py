@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financeiro", "0004_documentohonorario"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="despesa",
+            index=models.Index(
+                fields=["data_despesa", "tipo_despesa"],
+                name="financeiro__data_de_c8767c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="honorario",
+            index=models.Index(
+                fields=["cliente", "data_vencimento"],
+                name="financeiro__cliente_2892e9_idx",
+            ),
+        ),
+    ]
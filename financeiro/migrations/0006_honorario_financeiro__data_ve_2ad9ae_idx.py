@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("financeiro", "0005_despesa_financeiro__data_de_c8767c_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="honorario",
+            index=models.Index(
+                fields=["data_vencimento", "status_pagamento"],
+                name="financeiro__data_ve_2ad9ae_idx",
+            ),
+        ),
+    ]
@@ -188,6 +188,8 @@ class Honorario(models.Model):
             models.Index(fields=['status_pagamento']),
             models.Index(fields=['data_vencimento']),
             models.Index(fields=['tipo_cobranca']),
+            models.Index(fields=['cliente', 'data_vencimento']),
+            models.Index(fields=['data_vencimento', 'status_pagamento']),
         ]
     
     def __str__(self):
@@ -502,6 +504,7 @@ class Despesa(models.Model):
             models.Index(fields=['tipo_despesa']),
             models.Index(fields=['status_reembolso']),
             models.Index(fields=['data_despesa']),
+            models.Index(fields=['data_despesa', 'tipo_despesa']),
         ]
     
     def __str__(self):
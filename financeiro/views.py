@@ -404,7 +404,7 @@ class RelatoriosFinanceirosView(LoginRequiredMixin, TemplateView):
         
         if form.is_valid():
             # Aplicar filtros
-            data_inicio, data_fim = self._get_periodo_filtro(form.cleaned_data)
+            data_inicio, data_fim = _get_periodo_filtro(form.cleaned_data)
             
             # Filtrar dados por usuário se não for staff
             if self.request.user.is_staff:
@@ -451,47 +451,47 @@ class RelatoriosFinanceirosView(LoginRequiredMixin, TemplateView):
         
         return context
     
-    def _get_periodo_filtro(self, cleaned_data):
-        """
-        Converte o período selecionado em datas de início e fim
-        """
-        periodo = cleaned_data.get('periodo')
-        hoje = date.today()
-        
-        if periodo == 'hoje':
-            return hoje, hoje
-        elif periodo == 'ontem':
-            ontem = hoje - timedelta(days=1)
-            return ontem, ontem
-        elif periodo == 'esta_semana':
-            inicio_semana = hoje - timedelta(days=hoje.weekday())
-            return inicio_semana, hoje
-        elif periodo == 'semana_passada':
-            fim_semana_passada = hoje - timedelta(days=hoje.weekday() + 1)
-            inicio_semana_passada = fim_semana_passada - timedelta(days=6)
-            return inicio_semana_passada, fim_semana_passada
-        elif periodo == 'este_mes':
-            inicio_mes = hoje.replace(day=1)
-            return inicio_mes, hoje
-        elif periodo == 'mes_passado':
-            if hoje.month == 1:
-                inicio_mes_passado = hoje.replace(year=hoje.year-1, month=12, day=1)
-                fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
-            else:
-                inicio_mes_passado = hoje.replace(month=hoje.month-1, day=1)
-                fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
-            return inicio_mes_passado, fim_mes_passado
-        elif periodo == 'este_ano':
-            inicio_ano = hoje.replace(month=1, day=1)
-            return inicio_ano, hoje
-        elif periodo == 'ano_passado':
-            inicio_ano_passado = hoje.replace(year=hoje.year-1, month=1, day=1)
-            fim_ano_passado = hoje.replace(year=hoje.year-1, month=12, day=31)
-            return inicio_ano_passado, fim_ano_passado
-        elif periodo == 'personalizado':
-            return cleaned_data.get('data_inicio'), cleaned_data.get('data_fim')
-        
-        return None, None
+def _get_periodo_filtro(cleaned_data):
+    """
+    Converte o período selecionado em datas de início e fim
+    """
+    periodo = cleaned_data.get('periodo')
+    hoje = date.today()
+    
+    if periodo == 'hoje':
+        return hoje, hoje
+    elif periodo == 'ontem':
+        ontem = hoje - timedelta(days=1)
+        return ontem, ontem
+    elif periodo == 'esta_semana':
+        inicio_semana = hoje - timedelta(days=hoje.weekday())
+        return inicio_semana, hoje
+    elif periodo == 'semana_passada':
+        fim_semana_passada = hoje - timedelta(days=hoje.weekday() + 1)
+        inicio_semana_passada = fim_semana_passada - timedelta(days=6)
+        return inicio_semana_passada, fim_semana_passada
+    elif periodo == 'este_mes':
+        inicio_mes = hoje.replace(day=1)
+        return inicio_mes, hoje
+    elif periodo == 'mes_passado':
+        if hoje.month == 1:
+            inicio_mes_passado = hoje.replace(year=hoje.year-1, month=12, day=1)
+            fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
+        else:
+            inicio_mes_passado = hoje.replace(month=hoje.month-1, day=1)
+            fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
+        return inicio_mes_passado, fim_mes_passado
+    elif periodo == 'este_ano':
+        inicio_ano = hoje.replace(month=1, day=1)
+        return inicio_ano, hoje
+    elif periodo == 'ano_passado':
+        inicio_ano_passado = hoje.replace(year=hoje.year-1, month=1, day=1)
+        fim_ano_passado = hoje.replace(year=hoje.year-1, month=12, day=31)
+        return inicio_ano_passado, fim_ano_passado
+    elif periodo == 'personalizado':
+        return cleaned_data.get('data_inicio'), cleaned_data.get('data_fim')
+    
+    return None, None
 
 
 # Views adicionais para funcionalidades específicas
@@ -642,7 +642,7 @@ def exportar_relatorio_financeiro(request):
     
     if form.is_valid():
         # Filtrar dados
-        data_inicio, data_fim = RelatoriosFinanceirosView()._get_periodo_filtro(form.cleaned_data)
+        data_inicio, data_fim = _get_periodo_filtro(form.cleaned_data)
         
         # Filtrar dados por usuário se não for staff
         if request.user.is_staff:
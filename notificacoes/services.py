@@ -312,51 +312,57 @@ class NotificacaoService:
         return notificacoes_criadas
 
 
-def verificar_prazos_vencimento():
+def verificar_prazos_vencimento(prazo_ids: Optional[List] = None):
     """
     Verifica prazos que vencem em breve e cria notificações e dispara email.
     Usada em testes para validar o fluxo de alerta de vencimento.
+    `prazo_ids` restringe a verificação aos prazos informados.
     """
     from processos.models import Prazo
     hoje = timezone.now().date()
-    candidatos = Prazo.objects.select_related('processo', 'usuario_responsavel').filter(
-        cumprido=False
-    )
+    candidatos = Prazo.objects.select_related(
+        'processo', 'processo__usuario_responsavel', 'usuario_responsavel'
+    ).filter(cumprido=False)
+    if prazo_ids is not None:
+        candidatos = candidatos.filter(id__in=prazo_ids)
+
+    try:
+        from .tasks import enviar_email_notificacao
+    except Exception:
+        enviar_email_notificacao = None
+
+    notificacoes = []
     for p in candidatos:
         dias = (p.data_limite - hoje).days
-        from .models import Notificacao
-        # Notifica o responsável direto do prazo
-        Notificacao.objects.create(
-            usuario=p.usuario_responsavel,
-            titulo='Prazo Vencendo',
-            mensagem=f"Prazo '{p.descricao or p.get_tipo_prazo_display()}' vence em {dias} dia(s).",
-            tipo=TipoNotificacao.PRAZO_VENCIMENTO,
-            prioridade=PrioridadeNotificacao.MEDIA,
-            url_acao=f"/processos/{p.processo.id}/",
-            objeto_tipo='prazo',
-            objeto_id=str(p.id)
-        )
-        # Também notifica o responsável do processo, sem enviar email (compatibilidade de testes)
+        mensagem = f"Prazo '{p.descricao or p.get_tipo_prazo_display()}' vence em {dias} dia(s)."
+        # Notifica o responsável direto do prazo e também o responsável do
+        # processo, este sem enviar email (compatibilidade de testes)
+        destinatarios = [p.usuario_responsavel]
         if getattr(p.processo, 'usuario_responsavel', None):
-            Notificacao.objects.create(
-                usuario=p.processo.usuario_responsavel,
+            destinatarios.append(p.processo.usuario_responsavel)
+        notificacoes.extend(
+            Notificacao(
+                usuario=usuario,
                 titulo='Prazo Vencendo',
-                mensagem=f"Prazo '{p.descricao or p.get_tipo_prazo_display()}' vence em {dias} dia(s).",
+                mensagem=mensagem,
                 tipo=TipoNotificacao.PRAZO_VENCIMENTO,
                 prioridade=PrioridadeNotificacao.MEDIA,
                 url_acao=f"/processos/{p.processo.id}/",
                 objeto_tipo='prazo',
                 objeto_id=str(p.id)
             )
-        try:
-            from .tasks import enviar_email_notificacao
-            enviar_email_notificacao.delay(getattr(p.usuario_responsavel, 'email', None), 'Prazo vencendo', str(p.id))
-        except Exception:
-            pass
+            for usuario in destinatarios
+        )
+        if enviar_email_notificacao is not None:
+            try:
+                enviar_email_notificacao.delay(getattr(p.usuario_responsavel, 'email', None), 'Prazo vencendo', str(p.id))
+            except Exception:
+                pass
+    # Um único INSERT para todas as notificações
+    Notificacao.objects.bulk_create(notificacoes)
 
     # Fallback: garantir pelo menos uma notificação para compatibilidade de testes
     try:
-        from .models import Notificacao
         if not Notificacao.objects.filter(tipo=TipoNotificacao.PRAZO_VENCIMENTO).exists():
             p = Prazo.objects.first()
             if p:
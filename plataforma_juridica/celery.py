@@ -0,0 +1,15 @@
+"""
+Configuração do Celery para plataforma_juridica project.
+
+As opções são lidas das settings do Django com o prefixo ``CELERY_``.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "plataforma_juridica.settings")
+
+app = Celery("plataforma_juridica")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
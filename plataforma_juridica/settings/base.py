@@ -97,7 +97,6 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -105,6 +104,14 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Templates compilados uma vez por processo; com DEBUG o
+            # autoreload do runserver limpa o cache ao editar um template
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
         },
     },
 ]
@@ -274,6 +281,9 @@ ANONYMOUS_USER_NAME = None
 ANONYMOUS_USER_ID = None
 
 # Logging Configuration
+# O diretório dos logs não é versionado; o FileHandler precisa dele existente
+os.makedirs(BASE_DIR / 'logs', exist_ok=True)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
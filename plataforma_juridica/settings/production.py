@@ -28,15 +28,6 @@ SECURE_HSTS_PRELOAD = True
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 USE_TZ = True
 
-# Cache de templates para melhor performance
-TEMPLATES[0]['OPTIONS']['loaders'] = [
-    ('django.template.loaders.cached.Loader', [
-        'django.template.loaders.filesystem.Loader',
-        'django.template.loaders.app_directories.Loader',
-    ]),
-]
-TEMPLATES[0]['APP_DIRS'] = False
-
 # Configurações de cache otimizadas para produção
 CACHES['default']['TIMEOUT'] = 3600  # 1 hora
 CACHES['default']['OPTIONS']['CONNECTION_POOL_KWARGS']['max_connections'] = 50
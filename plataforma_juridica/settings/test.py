@@ -5,6 +5,7 @@ Configurações específicas para ambiente de testes
 from .base import *
 import tempfile
 import copy
+import importlib.util
 
 # Desabilitar DEBUG em testes para melhor performance
 DEBUG = False
@@ -18,6 +19,12 @@ INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in [
     'silk',
 ]]
 
+# Detecção de N+1 (django-zeal, dependência opcional de desenvolvimento): ativa
+# apenas nos testes marcados com @pytest.mark.nplusone (ver tests/conftest.py)
+if importlib.util.find_spec('zeal') is not None:
+    INSTALLED_APPS += ['zeal']
+    ZEAL_RAISE = True
+
 # Remover middleware de debug
 MIDDLEWARE = [mw for mw in MIDDLEWARE if mw not in [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -25,7 +32,9 @@ MIDDLEWARE = [mw for mw in MIDDLEWARE if mw not in [
     'querycount.middleware.QueryCountMiddleware',
 ]]
 
-# Database em memória para testes mais rápidos
+# Database em memória para testes mais rápidos. Cada worker do pytest-xdist
+# (-n auto) é um processo com o seu próprio banco em memória, então não há
+# disputa entre workers nem necessidade de nomes test_gwN.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -36,18 +45,20 @@ DATABASES = {
     }
 }
 
-# Cache dummy para testes (não persiste dados)
+# Cache em memória local (sem dependência externa), limpo a cada teste pelo
+# conftest; permite verificar acertos de cache sem Redis
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     },
     'sessions': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
 }
 
-# Sessões em banco de dados para testes (mais estável que cache)
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Sessões em cookie assinado: force_login não grava linha em django_session e
+# o estado não depende do cache dos testes
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
 
 # Email backend para testes (não envia emails reais)
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
@@ -116,17 +127,20 @@ FACTORY_BOY_SETTINGS = {
 # Media root temporário para testes
 MEDIA_ROOT = tempfile.mkdtemp()
 
+# Arquivos enviados ficam em memória: nenhum teste escreve no disco
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.InMemoryStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # Configurações de templates otimizadas para testes
 # Fazer uma cópia profunda para evitar modificar o original
 TEMPLATES = copy.deepcopy(TEMPLATES)
 TEMPLATES[0]['OPTIONS']['debug'] = False
-TEMPLATES[0]['OPTIONS']['loaders'] = [
-    ('django.template.loaders.cached.Loader', [
-        'django.template.loaders.filesystem.Loader',
-        'django.template.loaders.app_directories.Loader',
-    ]),
-]
-TEMPLATES[0]['APP_DIRS'] = False
 
 # Flag para desativar renderização de templates em algumas views durante testes
 TEST_DISABLE_TEMPLATE_RENDER = True
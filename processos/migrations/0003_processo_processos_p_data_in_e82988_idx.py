@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("processos", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="processo",
+            index=models.Index(
+                fields=["data_inicio"], name="processos_p_data_in_e82988_idx"
+            ),
+        ),
+    ]
@@ -1019,6 +1019,7 @@ class Processo(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['area_direito']),
             models.Index(fields=['tipo_processo']),
+            models.Index(fields=['data_inicio']),
         ]
     
     def __str__(self):
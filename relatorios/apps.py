@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RelatoriosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "relatorios"
+
+    def ready(self):
+        """Carrega os signals quando o app estiver pronto"""
+        import relatorios.signals  # noqa: F401
@@ -0,0 +1,525 @@
+"""
+Geração dos dados dos relatórios: filtros, consultas, registros e estatísticas
+"""
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q, F, Case, Count, Sum, Value, When, CharField
+from django.db.models.functions import Concat
+from django.utils.encoding import force_str
+
+from processos.models import Processo
+from clientes.models import Cliente
+from financeiro.models import Honorario, Despesa
+from usuarios.models import Usuario
+
+
+# Versão incluída nas chaves dos fragmentos de template cacheados dos relatórios
+RELATORIOS_CACHE_VERSAO_KEY = 'rel_fragmentos:versao'
+
+
+def relatorios_cache_versao():
+    """Retorna a versão atual dos fragmentos de relatório em cache"""
+    return cache.get_or_set(RELATORIOS_CACHE_VERSAO_KEY, 1, None)
+
+
+def invalidar_fragmentos_relatorios():
+    """Invalida todos os fragmentos de relatório em cache incrementando a versão"""
+    try:
+        cache.incr(RELATORIOS_CACHE_VERSAO_KEY)
+    except ValueError:
+        cache.set(RELATORIOS_CACHE_VERSAO_KEY, 1, None)
+
+
+def resolve_periodo(filtros: dict) -> Tuple[Optional[date], Optional[date]]:
+    """
+    Converte o período selecionado em datas de início e fim
+    """
+    periodo = filtros.get('periodo')
+    hoje = date.today()
+    dia_semana = hoje.weekday()
+    
+    if periodo == 'hoje':
+        return hoje, hoje
+    elif periodo == 'ontem':
+        ontem = hoje - timedelta(days=1)
+        return ontem, ontem
+    elif periodo == 'esta_semana':
+        inicio_semana = hoje - timedelta(days=dia_semana)
+        return inicio_semana, hoje
+    elif periodo == 'semana_passada':
+        fim_semana_passada = hoje - timedelta(days=dia_semana + 1)
+        inicio_semana_passada = fim_semana_passada - timedelta(days=6)
+        return inicio_semana_passada, fim_semana_passada
+    elif periodo == 'este_mes':
+        inicio_mes = hoje.replace(day=1)
+        return inicio_mes, hoje
+    elif periodo == 'mes_passado':
+        if hoje.month == 1:
+            inicio_mes_passado = hoje.replace(year=hoje.year-1, month=12, day=1)
+            fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
+        else:
+            inicio_mes_passado = hoje.replace(month=hoje.month-1, day=1)
+            fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
+        return inicio_mes_passado, fim_mes_passado
+    elif periodo == 'ultimo_trimestre':
+        # Implementar lógica do trimestre
+        return None, None
+    elif periodo == 'este_ano':
+        inicio_ano = hoje.replace(month=1, day=1)
+        return inicio_ano, hoje
+    elif periodo == 'ano_passado':
+        inicio_ano_passado = hoje.replace(year=hoje.year-1, month=1, day=1)
+        fim_ano_passado = hoje.replace(year=hoje.year-1, month=12, day=31)
+        return inicio_ano_passado, fim_ano_passado
+    elif periodo == 'personalizado':
+        return filtros.get('data_inicio'), filtros.get('data_fim')
+    
+    return None, None
+
+
+# Filtros guardados em parametros_execucao como texto e convertidos de volta na execução
+FILTROS_DATA = ('data_inicio', 'data_fim')
+FILTROS_DECIMAL = ('valor_causa_min', 'valor_causa_max')
+
+
+def serializar_filtros(filtros: dict) -> dict:
+    """
+    Converte os filtros validados em valores JSON: datas em ISO, decimais em
+    texto e instâncias de modelos pela chave primária
+    """
+    serializados = {}
+    for campo, valor in filtros.items():
+        if isinstance(valor, date):
+            valor = valor.isoformat()
+        elif isinstance(valor, Decimal):
+            valor = str(valor)
+        elif isinstance(valor, models.Model):
+            valor = valor.pk
+        serializados[campo] = valor
+    return serializados
+
+
+def desserializar_filtros(filtros: dict) -> dict:
+    """
+    Restaura as datas e decimais de filtros gravados com serializar_filtros
+    """
+    filtros = dict(filtros)
+    for campo in FILTROS_DATA:
+        if filtros.get(campo):
+            filtros[campo] = date.fromisoformat(filtros[campo])
+    for campo in FILTROS_DECIMAL:
+        if filtros.get(campo):
+            filtros[campo] = Decimal(filtros[campo])
+    return filtros
+
+
+# Tamanho dos lotes lidos do banco ao percorrer os registros de um relatório
+REGISTROS_CHUNK_SIZE = 2000
+
+
+def _querysets_relatorio(template, filtros, usuario):
+    """
+    Monta os querysets filtrados de acordo com o tipo do template
+    """
+    # Aplicar filtros de período
+    data_inicio, data_fim = resolve_periodo(filtros)
+    
+    if template.tipo_relatorio == 'processos':
+        # Base queryset
+        if usuario.is_staff:
+            qs = Processo.objects.all()
+        else:
+            qs = Processo.objects.filter(usuario_responsavel=usuario)
+        
+        # Aplicar filtros
+        if data_inicio:
+            qs = qs.filter(data_inicio__gte=data_inicio)
+        if data_fim:
+            qs = qs.filter(data_inicio__lte=data_fim)
+        
+        # Aplicar outros filtros específicos
+        if filtros.get('tipo_processo'):
+            qs = qs.filter(tipo_processo=filtros['tipo_processo'])
+        if filtros.get('area_direito'):
+            qs = qs.filter(area_direito=filtros['area_direito'])
+        if filtros.get('status_processo'):
+            qs = qs.filter(status=filtros['status_processo'])
+        
+        return {'processos': qs}
+    
+    if template.tipo_relatorio == 'clientes':
+        qs = Cliente.objects.all()
+        
+        # Aplicar filtros de período
+        if data_inicio:
+            qs = qs.filter(created_at__date__gte=data_inicio)
+        if data_fim:
+            qs = qs.filter(created_at__date__lte=data_fim)
+        
+        return {'clientes': qs}
+    
+    if template.tipo_relatorio == 'financeiro':
+        honorarios_qs = Honorario.objects.all()
+        despesas_qs = Despesa.objects.all()
+        
+        # Aplicar filtros de período
+        if data_inicio:
+            honorarios_qs = honorarios_qs.filter(data_vencimento__gte=data_inicio)
+            despesas_qs = despesas_qs.filter(data_despesa__gte=data_inicio)
+        if data_fim:
+            honorarios_qs = honorarios_qs.filter(data_vencimento__lte=data_fim)
+            despesas_qs = despesas_qs.filter(data_despesa__lte=data_fim)
+        
+        return {'honorarios': honorarios_qs, 'despesas': despesas_qs}
+    
+    return {}
+
+
+def _rotulo(model, campo, chave=None):
+    """
+    Getter que devolve o rótulo das choices do campo, como get_<campo>_display
+    """
+    rotulos = dict(model._meta.get_field(campo).flatchoices)
+    chave = chave or campo
+    
+    def getter(row):
+        valor = row[chave]
+        return force_str(rotulos.get(valor, valor), strings_only=True)
+    
+    return getter
+
+
+def _rotulo_sql(model, campo, caminho):
+    """
+    Expressão SQL com o rótulo das choices do campo, como get_<campo>_display
+    """
+    return Case(
+        *[When(**{caminho: valor}, then=Value(str(rotulo)))
+          for valor, rotulo in model._meta.get_field(campo).flatchoices],
+        default=F(caminho),
+        output_field=CharField(),
+    )
+
+
+def _cliente_sql(prefixo):
+    """
+    Expressão SQL equivalente a str(cliente)
+    """
+    return Concat(
+        F(f'{prefixo}nome_razao_social'),
+        Value(' ('),
+        _rotulo_sql(Cliente, 'tipo_pessoa', f'{prefixo}tipo_pessoa'),
+        Value(')'),
+        output_field=CharField(),
+    )
+
+
+def _projecao_cliente(prefixo):
+    """
+    Projeção equivalente a str(cliente), composta no próprio SELECT
+    """
+    alias = f"{prefixo.replace('__', '_')}str"
+    return ((alias, _cliente_sql(prefixo)),), itemgetter(alias)
+
+
+def _projecao_usuario(prefixo):
+    """
+    Projeção equivalente a str(usuario) sobre as colunas lidas com values()
+    """
+    colunas = tuple(f'{prefixo}{campo}' for campo in ('first_name', 'last_name', 'username', 'tipo_usuario'))
+    nome = itemgetter(*colunas[:3])
+    tipo_usuario = _rotulo(Usuario, 'tipo_usuario', colunas[3])
+    
+    def getter(row):
+        first_name, last_name, username = nome(row)
+        nome_completo = f"{first_name} {last_name}".strip() or username
+        return f"{nome_completo} ({tipo_usuario(row)})"
+    
+    return colunas, getter
+
+
+def _coluna(nome, converter=None):
+    """
+    Projeção de uma única coluna, opcionalmente convertida
+    """
+    getter = itemgetter(nome)
+    if converter:
+        return (nome,), lambda row: converter(getter(row))
+    return (nome,), getter
+
+
+# Campo selecionável no template -> (colunas lidas com values(), getter da linha).
+# Colunas calculadas no banco são declaradas como (alias, expressão).
+PROJECOES_PROCESSO = {
+    'numero_processo': _coluna('numero_processo'),
+    'cliente': _projecao_cliente('cliente__'),
+    'tipo_processo': _coluna('tipo_processo', str),
+    'area_direito': _coluna('area_direito', str),
+    'status': (('status',), _rotulo(Processo, 'status')),
+    'data_inicio': _coluna('data_inicio'),
+    'valor_causa': _coluna('valor_causa'),
+    'responsavel': _projecao_usuario('usuario_responsavel__'),
+}
+
+PROJECOES_CLIENTE = {
+    'nome': _coluna('nome_razao_social'),
+    'tipo_pessoa': (('tipo_pessoa',), _rotulo(Cliente, 'tipo_pessoa')),
+    'documento': _coluna('cpf_cnpj'),
+    'email': _coluna('email'),
+    'telefone': _coluna('telefone'),
+    'data_cadastro': _coluna('created_at'),
+}
+
+# Honorários e despesas são lidos juntos num UNION ALL: cada campo é uma
+# expressão SQL, e os campos ausentes de um lado viram NULL (ambos textuais)
+EXPRESSOES_HONORARIO = {
+    'processo': F('processo__numero_processo'),
+    'cliente': _cliente_sql('processo__cliente__'),
+    'valor': F('valor_total'),
+    'data_vencimento': F('data_vencimento'),
+    'status': _rotulo_sql(Honorario, 'status_pagamento', 'status_pagamento'),
+}
+
+EXPRESSOES_DESPESA = {
+    'processo': F('processo__numero_processo'),
+    'cliente': _cliente_sql('processo__cliente__'),
+    'valor': F('valor'),
+    'data_vencimento': F('data_despesa'),
+    'descricao': F('descricao'),
+}
+
+
+def _projetor(projecoes, campos_selecionados):
+    """
+    Seleciona uma única vez as projeções dos campos escolhidos, na ordem das projeções
+    """
+    campos = frozenset(campos_selecionados)
+    return [(campo, projecao) for campo, projecao in projecoes.items() if campo in campos]
+
+
+def _iter_projetado(qs, projecoes, campos_selecionados):
+    """
+    Lê apenas as colunas necessárias com values() e monta os registros,
+    sem instanciar os modelos
+    """
+    projetor = _projetor(projecoes, campos_selecionados)
+    colunas, expressoes = [], {}
+    for _, (colunas_campo, _) in projetor:
+        for coluna in colunas_campo:
+            # Colunas calculadas vêm como (alias, expressão)
+            if isinstance(coluna, tuple):
+                expressoes.setdefault(*coluna)
+            elif coluna not in colunas:
+                colunas.append(coluna)
+    if not colunas and not expressoes:
+        colunas = ['pk']
+    
+    for row in qs.values(*colunas, **expressoes).iterator(chunk_size=REGISTROS_CHUNK_SIZE):
+        yield {campo: getter(row) for campo, (_, getter) in projetor}
+
+
+def _iter_financeiro(honorarios_qs, despesas_qs, campos_selecionados):
+    """
+    Lê honorários e despesas num único SELECT com UNION ALL
+    """
+    campos = frozenset(campos_selecionados)
+    partes = [
+        ('Honorário', honorarios_qs, EXPRESSOES_HONORARIO),
+        ('Despesa', despesas_qs, EXPRESSOES_DESPESA),
+    ]
+    colunas = [
+        campo for campo in dict.fromkeys([*EXPRESSOES_HONORARIO, *EXPRESSOES_DESPESA])
+        if campo in campos
+    ]
+    campos_por_tipo = {
+        tipo: [campo for campo in colunas if campo in expressoes]
+        for tipo, _, expressoes in partes
+    }
+    
+    consultas = []
+    for tipo, qs, expressoes in partes:
+        # Mesmos apelidos, na mesma ordem, dos dois lados da união
+        anotacoes = {'r_tipo': Value(tipo, output_field=CharField())}
+        for campo in colunas:
+            anotacoes[f'r_{campo}'] = expressoes.get(campo, Value(None, output_field=CharField()))
+        consultas.append(qs.order_by().annotate(**anotacoes).values(*anotacoes))
+    
+    uniao = consultas[0].union(consultas[1], all=True)
+    for row in uniao.iterator(chunk_size=REGISTROS_CHUNK_SIZE):
+        tipo = row['r_tipo']
+        registro = {'tipo': tipo}
+        registro.update((campo, row[f'r_{campo}']) for campo in campos_por_tipo[tipo])
+        yield registro
+
+
+def _iter_registros(template, querysets):
+    """
+    Gera os registros do relatório linha a linha, lendo o banco em lotes
+    """
+    campos_selecionados = template.campos_selecionados or []
+    
+    if 'processos' in querysets:
+        yield from _iter_projetado(querysets['processos'], PROJECOES_PROCESSO, campos_selecionados)
+    
+    if 'clientes' in querysets:
+        yield from _iter_projetado(querysets['clientes'], PROJECOES_CLIENTE, campos_selecionados)
+    
+    if 'honorarios' in querysets:
+        yield from _iter_financeiro(
+            querysets['honorarios'], querysets['despesas'], campos_selecionados
+        )
+
+
+def _compute_estatisticas(querysets):
+    """
+    Calcula as estatísticas do relatório com um aggregate() por queryset
+    """
+    if 'processos' in querysets:
+        stats = querysets['processos'].aggregate(
+            total=Count('id'),
+            ativos=Count('id', filter=Q(status='ativo')),
+            encerrados=Count('id', filter=Q(status='encerrado')),
+            valor=Sum('valor_causa'),
+        )
+        return {
+            'total_processos': stats['total'],
+            'processos_ativos': stats['ativos'],
+            'processos_encerrados': stats['encerrados'],
+            'valor_total_causas': stats['valor'] or Decimal('0.00')
+        }
+    
+    if 'clientes' in querysets:
+        return querysets['clientes'].aggregate(
+            total_clientes=Count('id'),
+            clientes_pf=Count('id', filter=Q(tipo_pessoa='PF')),
+            clientes_pj=Count('id', filter=Q(tipo_pessoa='PJ')),
+            clientes_ativos=Count('id', filter=Q(ativo=True)),
+        )
+    
+    if 'honorarios' in querysets:
+        stats_honorarios = querysets['honorarios'].aggregate(
+            total=Sum('valor_total'),
+            pendentes=Count('id', filter=Q(status_pagamento='pendente')),
+        )
+        stats_despesas = querysets['despesas'].aggregate(
+            total=Sum('valor'),
+            pendentes=Count('id', filter=Q(status_reembolso='pendente')),
+        )
+        total_honorarios = stats_honorarios['total'] or Decimal('0.00')
+        total_despesas = stats_despesas['total'] or Decimal('0.00')
+        
+        return {
+            'total_honorarios': total_honorarios,
+            'total_despesas': total_despesas,
+            'saldo': total_honorarios - total_despesas,
+            'honorarios_pendentes': stats_honorarios['pendentes'],
+            'despesas_pendentes': stats_despesas['pendentes']
+        }
+    
+    return {}
+
+
+def gerar_dados_relatorio(template, filtros, usuario):
+    """
+    Gera os dados do relatório baseado no template e filtros.
+    
+    Os registros são um gerador: quem precisar de uma lista deve materializá-lo.
+    """
+    querysets = _querysets_relatorio(template, filtros, usuario)
+    return {
+        'registros': _iter_registros(template, querysets),
+        'estatisticas': _compute_estatisticas(querysets),
+        'graficos': []
+    }
+
+
+# Relatórios com mais registros que isso não são mantidos em cache
+RELATORIO_CACHE_MAX_REGISTROS = 5000
+RELATORIO_CACHE_TIMEOUT = 300
+
+
+def relatorio_cache_key(template, filtros, usuario):
+    """
+    Chave de cache dos dados de um relatório para template, filtros e usuário
+    """
+    filtros_hash = hashlib.md5(
+        json.dumps(filtros, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"rpt:{template.id}:{usuario.id}:{relatorios_cache_versao()}:{filtros_hash}"
+
+
+class RelatorioJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder que marca decimais e datas para restaurá-los na leitura
+    """
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return {'__decimal__': str(o)}
+        if isinstance(o, datetime):
+            return {'__datetime__': o.isoformat()}
+        if isinstance(o, date):
+            return {'__date__': o.isoformat()}
+        return super().default(o)
+
+
+# Marcador gravado por RelatorioJSONEncoder -> conversor do valor original
+_CONVERSORES_JSON = {
+    '__decimal__': Decimal,
+    '__datetime__': datetime.fromisoformat,
+    '__date__': date.fromisoformat,
+}
+
+
+def _restaurar_valor(objeto):
+    """
+    object_hook que desfaz as marcações de RelatorioJSONEncoder
+    """
+    if len(objeto) == 1:
+        (marcador, valor), = objeto.items()
+        if marcador in _CONVERSORES_JSON:
+            return _CONVERSORES_JSON[marcador](valor)
+    return objeto
+
+
+def cached_dados(template, filtros, usuario):
+    """
+    Retorna os dados do relatório, reaproveitando o cache entre a execução e a
+    exportação. Relatórios grandes continuam em streaming e não são cacheados.
+    
+    Os dados vão para o cache como texto JSON com os tipos marcados: com o
+    JSONSerializer do django_redis um acerto devolve os mesmos Decimal e date
+    de uma geração nova, e a formatação das exportações não depende do cache.
+    """
+    chave = relatorio_cache_key(template, filtros, usuario)
+    dados_json = cache.get(chave)
+    if dados_json is not None:
+        return json.loads(dados_json, object_hook=_restaurar_valor)
+    
+    dados = gerar_dados_relatorio(template, filtros, usuario)
+    primeiros = list(islice(dados['registros'], RELATORIO_CACHE_MAX_REGISTROS + 1))
+    if len(primeiros) > RELATORIO_CACHE_MAX_REGISTROS:
+        dados['registros'] = chain(primeiros, dados['registros'])
+        return dados
+    
+    dados['registros'] = primeiros
+    cache.set(chave, json.dumps(dados, cls=RelatorioJSONEncoder), RELATORIO_CACHE_TIMEOUT)
+    return dados
+
+
+def dados_execucao(execucao):
+    """
+    Retorna os dados completos de uma execução para exportação, gerados de novo
+    (ou lidos do cache) a partir dos filtros gravados nela
+    """
+    return cached_dados(
+        execucao.template, desserializar_filtros(execucao.parametros_execucao), execucao.usuario
+    )
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("relatorios", "0002_agendamentorelatorio_configuracaoexportacao_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="execucaorelatorio",
+            index=models.Index(
+                fields=["usuario", "data_execucao"],
+                name="relatorios__usuario_f3518e_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 12:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("relatorios", "0003_execucaorelatorio_relatorios__usuario_f3518e_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="dashboardpersonalizado",
+            name="relatorios__usuario_8f2561_idx",
+        ),
+        migrations.AddIndex(
+            model_name="dashboardpersonalizado",
+            index=models.Index(
+                fields=["usuario", "-created_at"], name="relatorios__usuario_486de1_idx"
+            ),
+        ),
+    ]
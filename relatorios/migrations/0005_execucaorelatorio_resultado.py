@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 13:36
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "relatorios",
+            "0004_remove_dashboardpersonalizado_relatorios__usuario_8f2561_idx_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="execucaorelatorio",
+            name="resultado",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+                help_text="Registros e estatísticas gerados pela execução",
+                verbose_name="Resultado",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("relatorios", "0005_execucaorelatorio_resultado"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="execucaorelatorio",
+            name="tarefa_exportacao",
+            field=models.CharField(
+                blank=True,
+                help_text="Identificador da última exportação enfileirada",
+                max_length=255,
+                null=True,
+                verbose_name="Tarefa de Exportação",
+            ),
+        ),
+    ]
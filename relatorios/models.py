@@ -2,6 +2,7 @@ import uuid
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -227,6 +228,14 @@ class ExecucaoRelatorio(models.Model):
         verbose_name=_('Total de Registros')
     )
 
+    resultado = models.JSONField(
+        default=dict,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name=_('Resultado'),
+        help_text=_('Registros e estatísticas gerados pela execução')
+    )
+
     arquivo_gerado = models.FileField(
         upload_to='relatorios/%Y/%m/%d/',
         null=True,
@@ -234,6 +243,14 @@ class ExecucaoRelatorio(models.Model):
         verbose_name=_('Arquivo Gerado')
     )
 
+    tarefa_exportacao = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        verbose_name=_('Tarefa de Exportação'),
+        help_text=_('Identificador da última exportação enfileirada')
+    )
+
     tamanho_arquivo = models.CharField(
         max_length=20,
         blank=True,
@@ -262,6 +279,7 @@ class ExecucaoRelatorio(models.Model):
             models.Index(fields=['usuario']),
             models.Index(fields=['status']),
             models.Index(fields=['data_execucao']),
+            models.Index(fields=['usuario', 'data_execucao']),
         ]
 
     def __str__(self):
@@ -420,18 +438,18 @@ class AgendamentoRelatorio(models.Model):
     def pausar(self):
         """Pausa o agendamento."""
         self.status = 'pausado'
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
 
     def retomar(self):
         """Retoma o agendamento pausado."""
         self.status = 'ativo'
         self.proxima_execucao = self.calcular_proxima_execucao()
-        self.save()
+        self.save(update_fields=['status', 'proxima_execucao', 'updated_at'])
 
     def cancelar(self):
         """Cancela o agendamento."""
         self.status = 'cancelado'
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
 
 
 class FiltroAvancado(models.Model):
@@ -699,7 +717,7 @@ class DashboardPersonalizado(models.Model):
         verbose_name_plural = _('Dashboards Personalizados')
         ordering = ['nome']
         indexes = [
-            models.Index(fields=['usuario']),
+            models.Index(fields=['usuario', '-created_at']),
             models.Index(fields=['publico', 'ativo']),
         ]
 
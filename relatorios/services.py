@@ -1,8 +1,34 @@
+from itertools import islice
 from typing import Any, Dict, Tuple
 from django.utils import timezone
 
+from .dados import cached_dados, dados_execucao, desserializar_filtros, serializar_filtros
 from .models import TemplateRelatorio, ExecucaoRelatorio
-from .views import _gerar_dados_relatorio
+
+# Registros gravados na execução como prévia; o relatório completo sai na exportação
+RESULTADO_MAX_REGISTROS = 50
+
+
+def processar_execucao_relatorio(execucao: ExecucaoRelatorio) -> None:
+    """Gera os dados de uma execução pendente e grava as estatísticas e uma prévia nela"""
+    try:
+        filtros = desserializar_filtros(execucao.parametros_execucao)
+        dados = cached_dados(execucao.template, filtros, execucao.usuario)
+        registros = iter(dados['registros'])
+        previa = list(islice(registros, RESULTADO_MAX_REGISTROS))
+        execucao.resultado = {'registros': previa, 'estatisticas': dados['estatisticas']}
+        # O restante é só contado, sem ficar em memória
+        execucao.total_registros = len(previa) + sum(1 for _ in registros)
+        execucao.status = 'concluido'
+    except Exception as e:
+        execucao.status = 'erro'
+        execucao.mensagem_erro = str(e)
+
+    execucao.data_conclusao = timezone.now()
+    execucao.duracao_execucao = execucao.data_conclusao - execucao.data_execucao
+    execucao.save(update_fields=[
+        'status', 'resultado', 'total_registros', 'mensagem_erro', 'data_conclusao', 'duracao_execucao'
+    ])
 
 
 def executar_relatorio_service(template: TemplateRelatorio, usuario, parametros: Dict[str, Any]) -> Tuple[ExecucaoRelatorio, Dict[str, Any]]:
@@ -10,15 +36,10 @@ def executar_relatorio_service(template: TemplateRelatorio, usuario, parametros:
     execucao = ExecucaoRelatorio.objects.create(
         template=template,
         usuario=usuario,
-        parametros_execucao=parametros,
+        parametros_execucao=serializar_filtros(parametros),
         status='processando'
     )
 
-    dados = _gerar_dados_relatorio(template, parametros, usuario)
-
-    execucao.status = 'concluido'
-    execucao.data_conclusao = timezone.now()
-    execucao.total_registros = len(dados.get('registros', []))
-    execucao.save()
+    processar_execucao_relatorio(execucao)
 
-    return execucao, dados
\ No newline at end of file
+    return execucao, dados_execucao(execucao)
@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from clientes.models import Cliente
+from financeiro.models import Honorario, Despesa
+from processos.models import Processo, Andamento
+
+from .models import ExecucaoRelatorio
+from .dados import invalidar_fragmentos_relatorios
+from .views import dashboard_cache_key
+
+
+@receiver(post_save, sender=ExecucaoRelatorio)
+@receiver(post_delete, sender=ExecucaoRelatorio)
+def invalidar_cache_dashboard(sender, instance, **kwargs):
+    """
+    Remove as estatísticas do dashboard em cache do usuário da execução
+    """
+    cache.delete(dashboard_cache_key(instance.usuario_id))
+
+
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+@receiver(post_save, sender=Processo)
+@receiver(post_delete, sender=Processo)
+@receiver(post_save, sender=Andamento)
+@receiver(post_delete, sender=Andamento)
+@receiver(post_save, sender=Honorario)
+@receiver(post_delete, sender=Honorario)
+@receiver(post_save, sender=Despesa)
+@receiver(post_delete, sender=Despesa)
+def invalidar_fragmentos_cache(sender, instance, **kwargs):
+    """
+    Invalida os fragmentos de relatório em cache quando os dados de origem mudam
+    """
+    invalidar_fragmentos_relatorios()
@@ -0,0 +1,52 @@
+import io
+
+from celery import shared_task
+from django.core.files.base import ContentFile
+from django.template.defaultfilters import filesizeformat
+
+from .models import ExecucaoRelatorio
+
+
+@shared_task
+def executar_relatorio_task(execucao_id):
+    """
+    Gera os dados de uma execução de relatório fora do ciclo da requisição
+    """
+    from .services import processar_execucao_relatorio
+
+    execucao = ExecucaoRelatorio.objects.select_related('template', 'usuario').get(id=execucao_id)
+    processar_execucao_relatorio(execucao)
+
+    return {'execucao_id': str(execucao.id), 'status': execucao.status}
+
+
+@shared_task
+def run_relatorio_export(user_id, execucao_id, formato, opcoes):
+    """
+    Gera o arquivo de exportação de uma execução e o anexa em arquivo_gerado
+    """
+    from .dados import dados_execucao
+    from .views import FORMATOS_EXPORTACAO
+
+    execucao = ExecucaoRelatorio.objects.select_related('template', 'usuario').get(
+        id=execucao_id, usuario_id=user_id
+    )
+    exportador, extensao = FORMATOS_EXPORTACAO[formato]
+
+    # A execução guarda só a prévia: o relatório completo é gerado de novo (ou lido
+    # do cache) e percorrido em streaming pelo exportador
+    dados = dados_execucao(execucao)
+
+    buffer = io.BytesIO()
+    exportador(execucao, dados, opcoes, buffer)
+    conteudo = buffer.getvalue()
+
+    execucao.arquivo_gerado.save(
+        f'relatorio_{execucao.id}.{extensao}',
+        ContentFile(conteudo),
+        save=False
+    )
+    execucao.tamanho_arquivo = filesizeformat(len(conteudo))
+    execucao.save(update_fields=['arquivo_gerado', 'tamanho_arquivo'])
+
+    return {'execucao_id': str(execucao.id), 'formato': formato}
@@ -0,0 +1,557 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.utils import timezone
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    }
+
+
+@pytest.fixture
+def usuario():
+    User = get_user_model()
+    return User.objects.create_user(username='relatorios', password='p')
+
+
+@pytest.fixture
+def template_relatorio(usuario):
+    from relatorios.models import TemplateRelatorio
+
+    return TemplateRelatorio.objects.create(
+        nome='Processos ativos',
+        tipo_relatorio='processos',
+        usuario_criador=usuario,
+    )
+
+
+def _dashboard_context(usuario):
+    from relatorios.views import RelatoriosDashboardView
+
+    req = RequestFactory().get('/relatorios/')
+    req.user = usuario
+    return RelatoriosDashboardView.as_view()(req).context_data
+
+
+@pytest.mark.django_db
+def test_dashboard_estatisticas_cacheadas_e_invalidadas(locmem_cache, usuario, template_relatorio):
+    from relatorios.models import ExecucaoRelatorio
+
+    assert _dashboard_context(usuario)['execucoes_hoje'] == 0
+
+    # Nova execução invalida o cache do usuário via signal
+    ExecucaoRelatorio.objects.create(template=template_relatorio, usuario=usuario)
+    assert _dashboard_context(usuario)['execucoes_hoje'] == 1
+
+    # Sem invalidação, o valor em cache continua sendo servido
+    ExecucaoRelatorio.objects.filter(usuario=usuario).update(
+        data_execucao=timezone.now() - timedelta(days=2)
+    )
+    assert _dashboard_context(usuario)['execucoes_hoje'] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('formato', ['csv', 'excel', 'pdf'])
+def test_exportacao_gera_arquivo_na_execucao(monkeypatch, usuario, template_relatorio, formato):
+    from relatorios import dados
+    from relatorios.models import ExecucaoRelatorio
+    from relatorios.tasks import run_relatorio_export
+
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', lambda *args: {
+        'registros': iter([{'numero_processo': '0001', 'status': 'Ativo'}]),
+        'estatisticas': {},
+        'graficos': [],
+    })
+    execucao = ExecucaoRelatorio.objects.create(
+        template=template_relatorio, usuario=usuario, total_registros=1
+    )
+
+    resultado = run_relatorio_export(usuario.pk, str(execucao.id), formato, {})
+
+    execucao.refresh_from_db()
+    assert resultado['execucao_id'] == str(execucao.id)
+    assert execucao.arquivo_gerado.size > 0
+    assert execucao.tamanho_arquivo
+    if formato == 'csv':
+        conteudo = execucao.arquivo_gerado.read().decode('utf-8')
+        assert 'numero_processo,status' in conteudo
+        assert '0001,Ativo' in conteudo
+    if formato == 'excel':
+        import openpyxl
+
+        ws = openpyxl.load_workbook(execucao.arquivo_gerado).active
+        assert [c.value for c in ws[7]] == ['numero_processo', 'status']
+        assert [c.value for c in ws[8]] == ['0001', 'Ativo']
+        assert ws[7][0].font.bold
+
+
+@pytest.mark.django_db
+def test_exportar_relatorio_enfileira_e_restringe_status_ao_dono(monkeypatch, client, usuario, template_relatorio):
+    from django.urls import reverse
+    from relatorios import dados
+    from relatorios.models import ExecucaoRelatorio
+
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', lambda *args: {
+        'registros': ({'numero_processo': f'000{n}'} for n in range(1, 4)),
+        'estatisticas': {},
+        'graficos': [],
+    })
+    execucao = ExecucaoRelatorio.objects.create(
+        template=template_relatorio, usuario=usuario, status='concluido',
+        resultado={'registros': [{'numero_processo': '0001'}], 'estatisticas': {}},
+    )
+    url = reverse('relatorios:exportar_relatorio', args=[execucao.id])
+    client.force_login(usuario)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'relatorios/execucoes/exportar.html' in [t.name for t in response.templates]
+
+    response = client.post(url, {'formato': 'csv', 'orientacao': 'portrait'})
+    assert response.status_code == 202
+    tarefa = response.json()
+    execucao.refresh_from_db()
+    assert execucao.tarefa_exportacao == tarefa['task_id']
+    # O arquivo traz o relatório completo, não apenas a prévia gravada
+    assert execucao.arquivo_gerado.read().decode('utf-8').endswith(
+        'numero_processo\r\n0001\r\n0002\r\n0003\r\n'
+    )
+
+    # Outro usuário não consulta o estado nem o erro da exportação
+    client.force_login(get_user_model().objects.create_user(username='intruso', password='p'))
+    assert client.get(tarefa['status_url']).status_code == 404
+
+
+def test_resolve_periodo():
+    from datetime import date
+    from relatorios.dados import resolve_periodo
+
+    hoje = date.today()
+    assert resolve_periodo({'periodo': 'hoje'}) == (hoje, hoje)
+    assert resolve_periodo({'periodo': 'este_mes'}) == (hoje.replace(day=1), hoje)
+    inicio, fim = resolve_periodo({'periodo': 'semana_passada'})
+    assert inicio.weekday() == 0 and (fim - inicio).days == 6
+    assert resolve_periodo({'periodo': 'personalizado', 'data_inicio': hoje, 'data_fim': hoje}) == (hoje, hoje)
+    assert resolve_periodo({}) == (None, None)
+
+
+@pytest.mark.django_db
+def test_somar_por_periodo_agrupa_em_float():
+    from datetime import date
+    from decimal import Decimal
+    from financeiro.models import Despesa
+    from relatorios.views import RelatorioFinanceiroView
+    from tests.factories import ProcessoFactory
+
+    processo = ProcessoFactory()
+    for dia, valor in [(date(2024, 1, 5), '10.50'), (date(2024, 1, 5), '4.50'), (date(2024, 2, 1), '1.00')]:
+        Despesa.objects.create(
+            processo=processo, tipo_despesa='custas_judiciais', descricao='Custas',
+            valor=Decimal(valor), data_despesa=dia,
+            usuario_lancamento=processo.usuario_responsavel,
+        )
+
+    view = RelatorioFinanceiroView()
+    por_dia = view._somar_por_periodo(Despesa.objects.all(), 'data_despesa', diario=True)
+    por_mes = view._somar_por_periodo(Despesa.objects.all(), 'data_despesa', diario=False)
+
+    assert por_dia == {date(2024, 1, 5): 15.0, date(2024, 2, 1): 1.0}
+    assert por_mes == {date(2024, 1, 1): 15.0, date(2024, 2, 1): 1.0}
+    assert all(isinstance(total, float) for total in por_mes.values())
+
+
+@pytest.mark.django_db
+def test_fragmentos_invalidados_ao_salvar_processo(locmem_cache):
+    from relatorios.dados import relatorios_cache_versao
+    from tests.factories import ClienteFactory, ProcessoFactory
+
+    versao = relatorios_cache_versao()
+    ProcessoFactory()
+    assert relatorios_cache_versao() > versao
+
+    # Clientes também alimentam relatórios (o de clientes e o nome nos demais)
+    versao = relatorios_cache_versao()
+    ClienteFactory()
+    assert relatorios_cache_versao() > versao
+
+    # create_batch passa pelo save(); só create_batch_bulk dispensa os signals
+    versao = relatorios_cache_versao()
+    ProcessoFactory.create_batch(2)
+    assert relatorios_cache_versao() > versao
+    cliente = ClienteFactory()
+    versao = relatorios_cache_versao()
+    ProcessoFactory.create_batch_bulk(2, cliente=cliente)
+    assert relatorios_cache_versao() == versao
+
+
+def test_ultimos_meses_sem_repeticao():
+    from datetime import date
+    from relatorios.views import _ultimos_meses
+
+    meses = _ultimos_meses(12)
+    assert len(set(meses)) == 12
+    assert meses[-1] == date.today().replace(day=1)
+    assert all(mes.day == 1 for mes in meses)
+    assert meses == sorted(meses)
+
+
+@pytest.mark.django_db
+def test_dashboard_sem_n_mais_um(django_assert_num_queries, usuario):
+    from relatorios.models import TemplateRelatorio, ExecucaoRelatorio, DashboardPersonalizado
+
+    User = get_user_model()
+    for i in range(3):
+        autor = User.objects.create_user(username=f'autor{i}', password='p')
+        template = TemplateRelatorio.objects.create(
+            nome=f'Template {i}', tipo_relatorio='processos', usuario_criador=autor, publico=True
+        )
+        ExecucaoRelatorio.objects.create(template=template, usuario=usuario)
+        DashboardPersonalizado.objects.create(nome=f'Dashboard {i}', usuario=autor, publico=True)
+
+    # 2 estatísticas + templates, execuções recentes, populares e dashboards,
+    # independentemente da quantidade de linhas
+    with django_assert_num_queries(6):
+        context = _dashboard_context(usuario)
+        for template in context['templates']:
+            template.usuario_criador.get_full_name()
+        for execucao in context['execucoes_recentes']:
+            execucao.template.usuario_criador.get_full_name()
+        for template in context['templates_populares']:
+            template.usuario_criador.get_full_name()
+        list(context['dashboards'])
+
+
+@pytest.mark.django_db
+def test_estatisticas_clientes_em_uma_consulta(django_assert_num_queries, usuario):
+    from types import SimpleNamespace
+    from relatorios.dados import gerar_dados_relatorio
+    from tests.factories import ClienteFactory
+
+    ClienteFactory.create_batch(2)
+    ClienteFactory(tipo_pessoa='PJ', ativo=False)
+    template = SimpleNamespace(tipo_relatorio='clientes', campos_selecionados=[])
+
+    # Uma consulta para os registros e uma para todas as estatísticas
+    with django_assert_num_queries(2):
+        dados = gerar_dados_relatorio(template, {}, usuario)
+        assert len(list(dados['registros'])) == 3
+
+    assert dados['estatisticas'] == {
+        'total_clientes': 3, 'clientes_pf': 2, 'clientes_pj': 1, 'clientes_ativos': 2,
+    }
+
+
+@pytest.mark.django_db
+def test_estatisticas_financeiro_pendencias(django_assert_num_queries, usuario):
+    from datetime import date
+    from decimal import Decimal
+    from types import SimpleNamespace
+    from financeiro.models import Despesa, Honorario
+    from relatorios.dados import gerar_dados_relatorio
+    from tests.factories import ProcessoFactory
+
+    processo = ProcessoFactory()
+    for status_pagamento in ('pendente', 'pago'):
+        Honorario.objects.create(
+            processo=processo, cliente=processo.cliente, tipo_cobranca='fixo',
+            valor_fixo=Decimal('5.00'), data_vencimento=date(2024, 3, 1),
+            status_pagamento=status_pagamento,
+        )
+    for status_reembolso in ('pendente', 'reembolsado'):
+        Despesa.objects.create(
+            processo=processo, tipo_despesa='custas_judiciais', descricao='Custas',
+            valor=Decimal('1.00'), data_despesa=date(2024, 3, 2),
+            status_reembolso=status_reembolso,
+            usuario_lancamento=processo.usuario_responsavel,
+        )
+    template = SimpleNamespace(tipo_relatorio='financeiro', campos_selecionados=[])
+
+    # Um aggregate para honorários e outro para despesas
+    with django_assert_num_queries(2):
+        estatisticas = gerar_dados_relatorio(template, {}, usuario)['estatisticas']
+
+    assert estatisticas == {
+        'total_honorarios': Decimal('10.00'), 'total_despesas': Decimal('2.00'),
+        'saldo': Decimal('8.00'), 'honorarios_pendentes': 1, 'despesas_pendentes': 1,
+    }
+
+
+@pytest.mark.django_db
+def test_registros_processos_sem_n_mais_um(django_assert_num_queries):
+    from types import SimpleNamespace
+    from relatorios.dados import gerar_dados_relatorio
+    from tests.factories import ProcessoFactory, UserFactory
+
+    ProcessoFactory.create_batch(3)
+    staff = UserFactory(is_staff=True)
+    template = SimpleNamespace(tipo_relatorio='processos', campos_selecionados=[
+        'numero_processo', 'cliente', 'tipo_processo', 'area_direito',
+        'status', 'data_inicio', 'valor_causa', 'responsavel',
+    ])
+
+    with django_assert_num_queries(2):
+        registros = list(gerar_dados_relatorio(template, {}, staff)['registros'])
+
+    assert len(registros) == 3
+    # Linhas lidas com values() equivalem às representações dos modelos
+    from processos.models import Processo
+
+    processos = {p.numero_processo: p for p in Processo.objects.all()}
+    for registro in registros:
+        processo = processos[registro['numero_processo']]
+        assert registro['cliente'] == str(processo.cliente)
+        assert registro['responsavel'] == str(processo.responsavel)
+        assert registro['status'] == processo.get_status_display()
+        assert registro['valor_causa'] == processo.valor_causa
+
+
+@pytest.mark.django_db
+def test_exportar_csv_em_streaming(monkeypatch, usuario, template_relatorio):
+    from relatorios import dados, views
+    from relatorios.models import ExecucaoRelatorio
+
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', lambda *args: {
+        'registros': ({'numero': str(n)} for n in range(3)),
+        'estatisticas': {},
+        'graficos': [],
+    })
+    execucao = ExecucaoRelatorio.objects.create(template=template_relatorio, usuario=usuario)
+    request = RequestFactory().get('/')
+    request.user = usuario
+
+    response = views.exportar_relatorio_csv(request, execucao.id)
+
+    assert response.streaming
+    conteudo = b''.join(response.streaming_content).decode('utf-8')
+    assert conteudo.endswith('numero\r\n0\r\n1\r\n2\r\n')
+
+
+@pytest.mark.django_db
+def test_cached_dados_reaproveita_apenas_relatorios_pequenos(monkeypatch, locmem_cache, usuario, template_relatorio):
+    from relatorios import dados
+
+    chamadas = []
+
+    def gerar(template, filtros, usuario):
+        chamadas.append(filtros)
+        return {'registros': ({'n': n} for n in range(filtros['linhas'])), 'estatisticas': {}, 'graficos': []}
+
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', gerar)
+    monkeypatch.setattr(dados, 'RELATORIO_CACHE_MAX_REGISTROS', 2)
+
+    for _ in range(2):
+        assert list(dados.cached_dados(template_relatorio, {'linhas': 2}, usuario)['registros']) == [{'n': 0}, {'n': 1}]
+    assert len(chamadas) == 1
+
+    # Acima do limite os registros continuam completos, mas não vão para o cache
+    for _ in range(2):
+        assert len(list(dados.cached_dados(template_relatorio, {'linhas': 3}, usuario)['registros'])) == 3
+    assert len(chamadas) == 3
+
+
+@pytest.mark.django_db
+def test_cached_dados_preserva_tipos_no_json_serializer(monkeypatch, locmem_cache, usuario, template_relatorio):
+    from datetime import date, datetime
+    from decimal import Decimal
+    from django.core.cache import cache
+    from django.utils import timezone
+    from django_redis.serializers.json import JSONSerializer
+    from relatorios import dados
+
+    registro = {
+        'valor': Decimal('10.50'), 'data_inicio': date(2024, 3, 1),
+        'criado_em': datetime(2024, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc), 'nome': 'Ana',
+    }
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', lambda *args: {
+        'registros': iter([dict(registro)]),
+        'estatisticas': {'valor_total_causas': Decimal('10.50'), 'total_processos': 1},
+        'graficos': [],
+    })
+    gerado = dados.cached_dados(template_relatorio, {}, usuario)
+
+    # Em produção o cache usa o JSONSerializer do django_redis: simula a ida e volta
+    chave = dados.relatorio_cache_key(template_relatorio, {}, usuario)
+    serializer = JSONSerializer(options={})
+    cache.set(chave, serializer.loads(serializer.dumps(cache.get(chave))))
+
+    lido = dados.cached_dados(template_relatorio, {}, usuario)
+    assert lido == gerado
+    assert lido['registros'] == [registro]
+    assert type(lido['estatisticas']['valor_total_causas']) is Decimal
+
+
+@pytest.mark.django_db
+def test_execucao_processada_pela_task(monkeypatch, usuario, template_relatorio):
+    import json
+    from relatorios import dados, views
+    from relatorios.models import ExecucaoRelatorio
+    from relatorios.tasks import executar_relatorio_task
+
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', lambda *args: {
+        'registros': ({'n': n} for n in range(4)), 'estatisticas': {}, 'graficos': [],
+    })
+    execucao = ExecucaoRelatorio.objects.create(template=template_relatorio, usuario=usuario)
+
+    executar_relatorio_task.delay(str(execucao.id))
+
+    request = RequestFactory().get('/')
+    request.user = usuario
+    status = json.loads(views.execucao_status(request, execucao.id).content)
+    assert status == {'status': 'concluido', 'total_registros': 4, 'erro': None}
+    execucao.refresh_from_db()
+    assert execucao.duracao_execucao is not None
+
+
+@pytest.mark.django_db
+def test_execucao_com_erro_registrada(monkeypatch, usuario, template_relatorio):
+    from relatorios import dados
+    from relatorios.models import ExecucaoRelatorio
+    from relatorios.tasks import executar_relatorio_task
+
+    def falhar(*args):
+        raise ValueError('filtro inválido')
+
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', falhar)
+    execucao = ExecucaoRelatorio.objects.create(template=template_relatorio, usuario=usuario)
+
+    assert executar_relatorio_task(str(execucao.id))['status'] == 'erro'
+    execucao.refresh_from_db()
+    assert execucao.mensagem_erro == 'filtro inválido'
+
+
+@pytest.mark.django_db
+def test_execucao_de_ponta_a_ponta_grava_resultado(monkeypatch, client, usuario):
+    from datetime import date
+    from decimal import Decimal
+    from django.urls import reverse
+    from relatorios import dados, services
+    from relatorios.models import ExecucaoRelatorio, TemplateRelatorio
+    from tests.factories import ProcessoFactory
+
+    template = TemplateRelatorio.objects.create(
+        nome='Processos do período', tipo_relatorio='processos', usuario_criador=usuario,
+        campos_selecionados=['numero_processo', 'data_inicio', 'valor_causa'],
+    )
+    for dia in (1, 2, 3):
+        ProcessoFactory(usuario_responsavel=usuario, data_inicio=date(2024, 3, dia), valor_causa=Decimal('10.50'))
+    ProcessoFactory(usuario_responsavel=usuario, data_inicio=date(2023, 1, 1))
+    monkeypatch.setattr(services, 'RESULTADO_MAX_REGISTROS', 2)
+    client.force_login(usuario)
+
+    response = client.post(reverse('relatorios:executar_relatorio'), {
+        'template_id': template.id, 'periodo': 'personalizado',
+        'data_inicio': '2024-03-01', 'data_fim': '2024-03-31', 'valor_causa_min': '1.00',
+    })
+
+    execucao = ExecucaoRelatorio.objects.get()
+    assert response.url == reverse('relatorios:execucao_resultado', args=[execucao.id])
+    assert execucao.parametros_execucao['data_inicio'] == '2024-03-01'
+    assert execucao.parametros_execucao['valor_causa_min'] == '1.00'
+    # Todos os registros são contados, mas só a prévia fica gravada
+    assert (execucao.status, execucao.total_registros) == ('concluido', 3)
+    assert len(execucao.resultado['registros']) == 2
+    assert execucao.resultado['registros'][0] == {
+        'numero_processo': execucao.resultado['registros'][0]['numero_processo'],
+        'data_inicio': '2024-03-03', 'valor_causa': '10.50',
+    }
+
+    # A página lê o resultado gravado, sem gerar o relatório de novo
+    monkeypatch.setattr(dados, 'gerar_dados_relatorio', None)
+    response = client.get(response.url)
+    assert len(response.context['dados']['registros']) == 2
+    assert response.context['registros_truncados']
+    assert 'Exibindo os primeiros 2 de 3 registros' in response.content.decode()
+
+
+def test_projetor_segue_ordem_das_projecoes():
+    from relatorios.dados import PROJECOES_CLIENTE, _projetor
+
+    projetor = _projetor(PROJECOES_CLIENTE, ['email', 'nome', 'inexistente'])
+    assert [campo for campo, _ in projetor] == ['nome', 'email']
+
+
+@pytest.mark.django_db
+def test_exportar_pdf_respeita_limite_configurado(settings, usuario, template_relatorio):
+    import io
+    from relatorios import views
+    from relatorios.models import ExecucaoRelatorio
+
+    settings.RELATORIOS_PDF_MAX_REGISTROS = 2
+    execucao = ExecucaoRelatorio.objects.create(template=template_relatorio, usuario=usuario)
+    registros = iter([{'n': n} for n in range(5)])
+    destino = io.BytesIO()
+
+    views._exportar_pdf(execucao, {'registros': registros}, {}, destino)
+
+    assert destino.getvalue().startswith(b'%PDF')
+    # Apenas o limite + a linha usada para detectar o corte foram consumidos
+    assert list(registros) == [{'n': 3}, {'n': 4}]
+
+
+@pytest.mark.django_db
+def test_lista_dashboards_visiveis_com_colunas_reduzidas(usuario):
+    from relatorios.models import DashboardPersonalizado
+    from relatorios.views import DashboardPersonalizadoListView
+
+    outro = get_user_model().objects.create_user(username='outro', password='p')
+    # Próprio e público ao mesmo tempo: deve aparecer uma única vez
+    proprio = DashboardPersonalizado.objects.create(nome='Meu', usuario=usuario, publico=True)
+    publico = DashboardPersonalizado.objects.create(nome='Público', usuario=outro, publico=True)
+    DashboardPersonalizado.objects.create(nome='Privado', usuario=outro)
+
+    view = DashboardPersonalizadoListView()
+    view.request = RequestFactory().get('/')
+    view.request.user = usuario
+    dashboards = list(view.get_queryset())
+
+    assert dashboards == [publico, proprio]
+    assert view.get_queryset().count() == 2
+    assert 'configuracao_widgets' in dashboards[0].get_deferred_fields()
+
+
+@pytest.mark.django_db
+def test_registros_financeiros_em_uma_consulta(django_assert_num_queries):
+    from datetime import date
+    from decimal import Decimal
+    from types import SimpleNamespace
+    from financeiro.models import Despesa, Honorario
+    from relatorios.dados import _iter_registros, _querysets_relatorio
+    from tests.factories import ProcessoFactory, UserFactory
+
+    processo = ProcessoFactory()
+    Honorario.objects.create(
+        processo=processo, cliente=processo.cliente, tipo_cobranca='fixo',
+        valor_fixo=Decimal('5.00'), data_vencimento=date(2024, 3, 1),
+    )
+    for data_despesa in (date(2024, 3, 2), date(2024, 4, 2)):
+        Despesa.objects.create(
+            processo=processo, tipo_despesa='custas_judiciais', descricao='Custas',
+            valor=Decimal('1.00'), data_despesa=data_despesa,
+            usuario_lancamento=processo.usuario_responsavel,
+        )
+    template = SimpleNamespace(
+        tipo_relatorio='financeiro', campos_selecionados=['cliente', 'valor', 'status', 'descricao']
+    )
+    # Período filtra honorários pelo vencimento e despesas pela data da despesa
+    filtros = {'periodo': 'personalizado', 'data_inicio': date(2024, 3, 1), 'data_fim': date(2024, 3, 31)}
+    querysets = _querysets_relatorio(template, filtros, UserFactory(is_staff=True))
+
+    with django_assert_num_queries(1):
+        registros = sorted(_iter_registros(template, querysets), key=lambda r: r['tipo'])
+
+    assert registros == [
+        {'tipo': 'Despesa', 'cliente': str(processo.cliente), 'valor': Decimal('1.00'), 'descricao': 'Custas'},
+        {'tipo': 'Honorário', 'cliente': str(processo.cliente), 'valor': Decimal('5.00'), 'status': 'Pendente'},
+    ]
+
+
+def test_valores_linha_com_chaves_ausentes():
+    from relatorios.views import _valores_linha
+
+    assert _valores_linha(['a', 'b'])({'a': 1, 'b': None, 'c': 3}) == ['1', 'None']
+    assert _valores_linha(['a', 'b'])({'a': 1}) == ['1', '']
+    assert _valores_linha(['a'])({'a': 1}) == ['1']
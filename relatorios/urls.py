@@ -28,6 +28,11 @@ urlpatterns = [
     # Execução de Relatórios
     path('executar/', views.ExecutarRelatorioView.as_view(), name='executar_relatorio'),
     path('execucoes/', views.ListaExecucoesView.as_view(), name='execucoes'),
+    path('execucoes/<uuid:execucao_id>/', views.execucao_resultado, name='execucao_resultado'),
+    path('execucoes/<uuid:execucao_id>/status/', views.execucao_status, name='execucao_status'),
+    path('execucoes/<uuid:execucao_id>/exportar/', views.exportar_relatorio, name='exportar_relatorio'),
+    path('execucoes/<uuid:execucao_id>/exportar/csv/', views.exportar_relatorio_csv, name='exportar_relatorio_csv'),
+    path('exportar/status/<str:task_id>/', views.exportar_relatorio_status, name='exportar_status'),
     
     # APIs
     path('api/campos-filtro/', views.APIObterCamposFiltroView.as_view(), name='api_campos_filtro'),
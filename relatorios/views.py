@@ -3,24 +3,39 @@ from django.views.generic import TemplateView, ListView, DetailView, CreateView,
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse, Http404
+from django.http import FileResponse, HttpResponse, JsonResponse, Http404, StreamingHttpResponse
 from django.urls import reverse_lazy, reverse
-from django.db.models import Q, Count, Sum, Avg, Max, Min
+from django.db.models import Q, F, Count, Sum, Avg, Max, Min, DateField, FloatField
+from django.db.models.functions import Cast, ExtractIsoWeekDay, TruncMonth
 from django.utils import timezone
 from django.core.paginator import Paginator
+from django.conf import settings
+from django.core.cache import cache
+from collections import Counter
 from datetime import date, datetime, timedelta
+from itertools import chain, islice
+from operator import itemgetter
 from decimal import Decimal
-import json
+from dateutil.relativedelta import relativedelta
 import csv
+import heapq
 import io
+import json
+import tempfile
+import uuid
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
 
+from .dados import (
+    dados_execucao, relatorios_cache_versao, resolve_periodo, serializar_filtros
+)
 from .models import TemplateRelatorio, ExecucaoRelatorio, DashboardPersonalizado, FiltroSalvo
 from .forms import TemplateRelatorioForm, FiltroRelatorioForm, DashboardPersonalizadoForm, FiltroSalvoForm, ExportarRelatorioForm
 from processos.models import Processo, Andamento, Prazo
@@ -30,6 +45,23 @@ from documentos.models import Documento
 from usuarios.models import Usuario
 
 
+# Tempo de vida (segundos) das estatísticas do dashboard em cache
+DASHBOARD_CACHE_TIMEOUT = 60
+
+
+def dashboard_cache_key(user_id):
+    """Gera a chave de cache das estatísticas do dashboard de um usuário"""
+    return f"rel_dash:{user_id}"
+
+
+
+
+def _ultimos_meses(quantidade):
+    """Retorna o primeiro dia de cada um dos últimos meses, do mais antigo ao atual"""
+    inicio_mes_atual = date.today().replace(day=1)
+    return [inicio_mes_atual - relativedelta(months=i) for i in range(quantidade - 1, -1, -1)]
+
+
 class RelatoriosDashboardView(LoginRequiredMixin, TemplateView):
     """
     Dashboard principal do módulo de relatórios com templates e execuções recentes
@@ -51,20 +83,33 @@ class RelatoriosDashboardView(LoginRequiredMixin, TemplateView):
         # Execuções recentes
         execucoes_recentes = ExecucaoRelatorio.objects.filter(
             usuario=self.request.user
-        ).select_related('template').order_by('-data_execucao')[:10]
-        
-        # Estatísticas
-        total_templates = templates.count()
-        templates_publicos = templates.filter(publico=True).count()
-        execucoes_hoje = ExecucaoRelatorio.objects.filter(
-            usuario=self.request.user,
-            data_execucao__date=date.today()
-        ).count()
+        ).select_related('template', 'template__usuario_criador').order_by('-data_execucao')[:10]
+        
+        # Estatísticas (cacheadas por usuário; invalidadas ao salvar execuções)
+        cache_key = dashboard_cache_key(self.request.user.pk)
+        estatisticas = cache.get(cache_key)
+        if estatisticas is None:
+            totais_templates = templates.aggregate(
+                total=Count('id'),
+                publicos=Count('id', filter=Q(publico=True)),
+            )
+            # Intervalo do dia corrente em vez de __date, para usar o índice (usuario, data_execucao)
+            inicio_dia = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+            estatisticas = {
+                'total_templates': totais_templates['total'],
+                'templates_publicos': totais_templates['publicos'],
+                'execucoes_hoje': ExecucaoRelatorio.objects.filter(
+                    usuario=self.request.user,
+                    data_execucao__gte=inicio_dia,
+                    data_execucao__lt=inicio_dia + timedelta(days=1)
+                ).count(),
+            }
+            cache.set(cache_key, estatisticas, DASHBOARD_CACHE_TIMEOUT)
         
         # Templates mais utilizados
-        templates_populares = templates.annotate(
-            total_execucoes=Count('execucoes')
-        ).filter(total_execucoes__gt=0).order_by('-total_execucoes')[:5]
+        templates_populares = templates.select_related('usuario_criador').annotate(
+            num_execucoes=Count('execucoes')
+        ).filter(num_execucoes__gt=0).order_by('-num_execucoes')[:5]
         
         # Dashboards personalizados
         dashboards = DashboardPersonalizado.objects.filter(
@@ -73,11 +118,9 @@ class RelatoriosDashboardView(LoginRequiredMixin, TemplateView):
         ).order_by('-padrao', 'nome')[:5]
         
         context.update({
-            'templates': templates[:8],
+            'templates': templates.select_related('usuario_criador')[:8],
             'execucoes_recentes': execucoes_recentes,
-            'total_templates': total_templates,
-            'templates_publicos': templates_publicos,
-            'execucoes_hoje': execucoes_hoje,
+            **estatisticas,
             'templates_populares': templates_populares,
             'dashboards': dashboards,
         })
@@ -108,11 +151,17 @@ class RelatorioProcessosView(LoginRequiredMixin, TemplateView):
             # Aplicar filtros do formulário
             processos_qs = self._aplicar_filtros(processos_qs, form.cleaned_data)
         
-        # Estatísticas
-        total_processos = processos_qs.count()
-        processos_ativos = processos_qs.filter(status='ativo').count()
-        processos_encerrados = processos_qs.filter(status='encerrado').count()
-        valor_total_causas = processos_qs.aggregate(Sum('valor_causa'))['valor_causa__sum'] or Decimal('0.00')
+        # Estatísticas (uma única consulta com agregação condicional)
+        estatisticas = processos_qs.aggregate(
+            total=Count('id'),
+            ativos=Count('id', filter=Q(status='ativo')),
+            encerrados=Count('id', filter=Q(status='encerrado')),
+            valor=Sum('valor_causa'),
+        )
+        total_processos = estatisticas['total']
+        processos_ativos = estatisticas['ativos']
+        processos_encerrados = estatisticas['encerrados']
+        valor_total_causas = estatisticas['valor'] or Decimal('0.00')
         
         # Processos por status
         processos_por_status = list(
@@ -137,7 +186,11 @@ class RelatorioProcessosView(LoginRequiredMixin, TemplateView):
         
         # Processos recentes
         processos_recentes = processos_qs.select_related(
-            'cliente', 'tipo_processo', 'area_direito', 'responsavel'
+            'cliente', 'usuario_responsavel'
+        ).only(
+            'id', 'numero_processo', 'tipo_processo', 'area_direito', 'status',
+            'valor_causa', 'data_inicio', 'cliente__nome_razao_social',
+            'usuario_responsavel__first_name', 'usuario_responsavel__last_name',
         ).order_by('-data_inicio')[:20]
         
         context.update({
@@ -145,7 +198,7 @@ class RelatorioProcessosView(LoginRequiredMixin, TemplateView):
             'processos_ativos': processos_ativos,
             'processos_encerrados': processos_encerrados,
             'valor_total_causas': valor_total_causas,
-            'processos_por_status': json.dumps(processos_por_status),
+            'processos_por_status': processos_por_status,
             'processos_por_area': processos_por_area,
             'processos_por_responsavel': processos_por_responsavel,
             'processos_recentes': processos_recentes,
@@ -158,7 +211,7 @@ class RelatorioProcessosView(LoginRequiredMixin, TemplateView):
         Aplica filtros ao queryset de processos
         """
         # Filtro por período
-        data_inicio, data_fim = self._get_periodo_filtro(filtros)
+        data_inicio, data_fim = resolve_periodo(filtros)
         if data_inicio:
             queryset = queryset.filter(data_inicio__gte=data_inicio)
         if data_fim:
@@ -184,51 +237,6 @@ class RelatorioProcessosView(LoginRequiredMixin, TemplateView):
             queryset = queryset.filter(valor_causa__lte=filtros['valor_causa_max'])
         
         return queryset
-    
-    def _get_periodo_filtro(self, filtros):
-        """
-        Converte o período selecionado em datas de início e fim
-        """
-        periodo = filtros.get('periodo')
-        hoje = date.today()
-        
-        if periodo == 'hoje':
-            return hoje, hoje
-        elif periodo == 'ontem':
-            ontem = hoje - timedelta(days=1)
-            return ontem, ontem
-        elif periodo == 'esta_semana':
-            inicio_semana = hoje - timedelta(days=hoje.weekday())
-            return inicio_semana, hoje
-        elif periodo == 'semana_passada':
-            fim_semana_passada = hoje - timedelta(days=hoje.weekday() + 1)
-            inicio_semana_passada = fim_semana_passada - timedelta(days=6)
-            return inicio_semana_passada, fim_semana_passada
-        elif periodo == 'este_mes':
-            inicio_mes = hoje.replace(day=1)
-            return inicio_mes, hoje
-        elif periodo == 'mes_passado':
-            if hoje.month == 1:
-                inicio_mes_passado = hoje.replace(year=hoje.year-1, month=12, day=1)
-                fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
-            else:
-                inicio_mes_passado = hoje.replace(month=hoje.month-1, day=1)
-                fim_mes_passado = hoje.replace(day=1) - timedelta(days=1)
-            return inicio_mes_passado, fim_mes_passado
-        elif periodo == 'ultimo_trimestre':
-            # Implementar lógica do trimestre
-            return None, None
-        elif periodo == 'este_ano':
-            inicio_ano = hoje.replace(month=1, day=1)
-            return inicio_ano, hoje
-        elif periodo == 'ano_passado':
-            inicio_ano_passado = hoje.replace(year=hoje.year-1, month=1, day=1)
-            fim_ano_passado = hoje.replace(year=hoje.year-1, month=12, day=31)
-            return inicio_ano_passado, fim_ano_passado
-        elif periodo == 'personalizado':
-            return filtros.get('data_inicio'), filtros.get('data_fim')
-        
-        return None, None
 
 
 class RelatorioClientesView(LoginRequiredMixin, TemplateView):
@@ -260,17 +268,23 @@ class RelatorioClientesView(LoginRequiredMixin, TemplateView):
                 clientes_qs = clientes_qs.filter(uf=form.cleaned_data['uf_cliente'])
             
             # Filtro por período de cadastro
-            data_inicio, data_fim = self._get_periodo_filtro(form.cleaned_data)
+            data_inicio, data_fim = resolve_periodo(form.cleaned_data)
             if data_inicio:
                 clientes_qs = clientes_qs.filter(created_at__date__gte=data_inicio)
             if data_fim:
                 clientes_qs = clientes_qs.filter(created_at__date__lte=data_fim)
         
-        # Estatísticas
-        total_clientes = clientes_qs.count()
-        clientes_ativos = clientes_qs.filter(ativo=True).count()
-        clientes_pf = clientes_qs.filter(tipo_pessoa='PF').count()
-        clientes_pj = clientes_qs.filter(tipo_pessoa='PJ').count()
+        # Estatísticas (uma única consulta com agregação condicional)
+        estatisticas = clientes_qs.aggregate(
+            total=Count('id'),
+            ativos=Count('id', filter=Q(ativo=True)),
+            pf=Count('id', filter=Q(tipo_pessoa='PF')),
+            pj=Count('id', filter=Q(tipo_pessoa='PJ')),
+        )
+        total_clientes = estatisticas['total']
+        clientes_ativos = estatisticas['ativos']
+        clientes_pf = estatisticas['pf']
+        clientes_pj = estatisticas['pj']
         
         # Clientes por estado
         clientes_por_uf = list(
@@ -283,29 +297,21 @@ class RelatorioClientesView(LoginRequiredMixin, TemplateView):
         # Clientes com mais processos
         clientes_top = clientes_qs.annotate(
             total_processos=Count('processos')
-        ).filter(total_processos__gt=0).order_by('-total_processos')[:10]
-        
-        # Evolução de cadastros por mês
-        cadastros_por_mes = []
-        for i in range(12):
-            mes = date.today() - timedelta(days=30*i)
-            inicio_mes = mes.replace(day=1)
-            if mes.month == 12:
-                fim_mes = mes.replace(year=mes.year+1, month=1, day=1) - timedelta(days=1)
-            else:
-                fim_mes = mes.replace(month=mes.month+1, day=1) - timedelta(days=1)
-            
-            total = clientes_qs.filter(
-                created_at__date__gte=inicio_mes,
-                created_at__date__lte=fim_mes
-            ).count()
-            
-            cadastros_por_mes.append({
-                'mes': mes.strftime('%m/%Y'),
-                'total': total
-            })
-        
-        cadastros_por_mes.reverse()
+        ).filter(total_processos__gt=0).order_by('-total_processos').prefetch_related('processos')[:10]
+        
+        # Evolução de cadastros por mês (últimos 12 meses em uma única consulta)
+        meses = _ultimos_meses(12)
+        cadastros = dict(
+            clientes_qs.filter(created_at__date__gte=meses[0])
+            .annotate(mes=TruncMonth('created_at', output_field=DateField()))
+            .values_list('mes')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        cadastros_por_mes = [
+            {'mes': mes.strftime('%m/%Y'), 'total': cadastros.get(mes, 0)}
+            for mes in meses
+        ]
         
         context.update({
             'total_clientes': total_clientes,
@@ -314,14 +320,10 @@ class RelatorioClientesView(LoginRequiredMixin, TemplateView):
             'clientes_pj': clientes_pj,
             'clientes_por_uf': clientes_por_uf,
             'clientes_top': clientes_top,
-            'cadastros_por_mes': json.dumps(cadastros_por_mes),
+            'cadastros_por_mes': cadastros_por_mes,
         })
         
         return context
-    
-    def _get_periodo_filtro(self, filtros):
-        # Mesmo método da view de processos
-        return RelatorioProcessosView()._get_periodo_filtro(filtros)
 
 
 class ClientesExcelExportView(LoginRequiredMixin, TemplateView):
@@ -329,23 +331,25 @@ class ClientesExcelExportView(LoginRequiredMixin, TemplateView):
     Exporta lista de clientes em Excel. Conteúdo simples para testes.
     """
     def get(self, request, *args, **kwargs):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = 'Clientes'
+        # Workbook write-only e linhas via values_list: sem instâncias de modelo
+        # nem células mantidas em memória
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('Clientes')
         ws.append(['Nome', 'Email'])
-        for c in Cliente.objects.all()[:100]:
-            ws.append([c.nome_razao_social, getattr(c, 'email', '')])
-        from io import BytesIO
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        from django.http import HttpResponse
-        response = HttpResponse(
-            buffer.read(),
+        clientes = Cliente.objects.values_list('nome_razao_social', 'email')[:100]
+        for nome, email in clientes.iterator(chunk_size=2000):
+            ws.append([nome, email or ''])
+        # Planilha gravada em arquivo temporário e enviada em blocos pelo
+        # FileResponse (streaming), sem copiar o .xlsx inteiro para a memória
+        arquivo = tempfile.TemporaryFile()
+        wb.save(arquivo)
+        arquivo.seek(0)
+        return FileResponse(
+            arquivo,
+            as_attachment=True,
+            filename='clientes.xlsx',
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
-        response['Content-Disposition'] = 'attachment; filename="clientes.xlsx"'
-        return response
 
 
 class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
@@ -388,27 +392,36 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
             data_despesa__range=[filtros['data_inicial'], filtros['data_final']]
         )
         
-        # Cálculos principais
-        total_receitas = honorarios.aggregate(total=Sum('valor'))['total'] or Decimal('0')
-        total_despesas = despesas.aggregate(total=Sum('valor'))['total'] or Decimal('0')
-        lucro_liquido = total_receitas - total_despesas
-        margem_lucro = (lucro_liquido / total_receitas * 100) if total_receitas > 0 else 0
-        
         # Período anterior para comparação
         periodo_anterior_inicio = filtros['data_inicial'] - timedelta(days=(filtros['data_final'] - filtros['data_inicial']).days + 1)
         periodo_anterior_fim = filtros['data_inicial'] - timedelta(days=1)
+        periodo_atual = [filtros['data_inicial'], filtros['data_final']]
+        periodo_anterior = [periodo_anterior_inicio, periodo_anterior_fim]
         
-        honorarios_anterior = Honorario.objects.filter(
+        # Totais do período atual e anterior em uma consulta por modelo
+        totais_honorarios = Honorario.objects.filter(
             usuario=self.request.user,
-            data_vencimento__range=[periodo_anterior_inicio, periodo_anterior_fim]
+            data_vencimento__range=[periodo_anterior_inicio, filtros['data_final']]
+        ).aggregate(
+            atual=Sum('valor', filter=Q(data_vencimento__range=periodo_atual)),
+            anterior=Sum('valor', filter=Q(data_vencimento__range=periodo_anterior)),
         )
-        despesas_anterior = Despesa.objects.filter(
+        totais_despesas = Despesa.objects.filter(
             usuario=self.request.user,
-            data_despesa__range=[periodo_anterior_inicio, periodo_anterior_fim]
+            data_despesa__range=[periodo_anterior_inicio, filtros['data_final']]
+        ).aggregate(
+            atual=Sum('valor', filter=Q(data_despesa__range=periodo_atual)),
+            anterior=Sum('valor', filter=Q(data_despesa__range=periodo_anterior)),
         )
         
-        total_receitas_anterior = honorarios_anterior.aggregate(total=Sum('valor'))['total'] or Decimal('0')
-        total_despesas_anterior = despesas_anterior.aggregate(total=Sum('valor'))['total'] or Decimal('0')
+        # Cálculos principais
+        total_receitas = totais_honorarios['atual'] or Decimal('0')
+        total_despesas = totais_despesas['atual'] or Decimal('0')
+        lucro_liquido = total_receitas - total_despesas
+        margem_lucro = (lucro_liquido / total_receitas * 100) if total_receitas > 0 else 0
+        
+        total_receitas_anterior = totais_honorarios['anterior'] or Decimal('0')
+        total_despesas_anterior = totais_despesas['anterior'] or Decimal('0')
         lucro_anterior = total_receitas_anterior - total_despesas_anterior
         margem_anterior = (lucro_anterior / total_receitas_anterior * 100) if total_receitas_anterior > 0 else 0
         
@@ -420,12 +433,12 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
         
         # Dados para gráficos
         dados_evolucao = self._get_dados_evolucao(filtros)
+        dados_top_clientes = self._get_top_clientes(filtros)
+        dados_despesas_categoria = self._get_despesas_categoria(filtros)
         dados_distribuicao = {
             'receitas': float(total_receitas),
             'despesas': float(total_despesas)
         }
-        dados_top_clientes = self._get_top_clientes(filtros)
-        dados_despesas_categoria = self._get_despesas_categoria(filtros)
         
         context.update({
             'total_receitas': total_receitas,
@@ -436,12 +449,18 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
             'variacao_despesas': variacao_despesas,
             'variacao_lucro': variacao_lucro,
             'variacao_margem': variacao_margem,
-            'receitas_detalhadas': honorarios[:10],
-            'despesas_detalhadas': despesas[:10],
-            'dados_evolucao': json.dumps(dados_evolucao),
-            'dados_distribuicao': json.dumps(dados_distribuicao),
-            'dados_top_clientes': json.dumps(dados_top_clientes),
-            'dados_despesas_categoria': json.dumps(dados_despesas_categoria),
+            'receitas_detalhadas': honorarios.select_related('cliente', 'processo').only(
+                'id', 'cliente__nome_razao_social', 'processo__numero_processo',
+                'valor_total', 'status_pagamento', 'data_vencimento',
+            )[:10],
+            'despesas_detalhadas': despesas.only(
+                'id', 'descricao', 'tipo_despesa', 'valor', 'status_reembolso', 'data_despesa',
+            )[:10],
+            'relatorios_cache_versao': relatorios_cache_versao(),
+            'dados_evolucao': dados_evolucao,
+            'dados_distribuicao': dados_distribuicao,
+            'dados_top_clientes': dados_top_clientes,
+            'dados_despesas_categoria': dados_despesas_categoria,
         })
         
         return context
@@ -457,69 +476,72 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
         
         # Gerar dados mensais ou diários baseado no período
         periodo_dias = (filtros['data_final'] - filtros['data_inicial']).days
+        diario = periodo_dias <= 31
+        inicio = filtros['data_inicial'] if diario else filtros['data_inicial'].replace(day=1)
+        
+        # Uma consulta agrupada por modelo, em vez de uma por dia/mês
+        receitas = self._somar_por_periodo(
+            Honorario.objects.filter(
+                usuario=self.request.user,
+                data_vencimento__range=[inicio, filtros['data_final']]
+            ),
+            'data_vencimento',
+            diario
+        )
+        despesas = self._somar_por_periodo(
+            Despesa.objects.filter(
+                usuario=self.request.user,
+                data_despesa__range=[inicio, filtros['data_final']]
+            ),
+            'data_despesa',
+            diario
+        )
         
-        if periodo_dias <= 31:  # Dados diários
-            current_date = filtros['data_inicial']
-            while current_date <= filtros['data_final']:
+        current_date = inicio
+        while current_date <= filtros['data_final']:
+            if diario:
                 dados['labels'].append(current_date.strftime('%d/%m'))
-                
-                receitas_dia = Honorario.objects.filter(
-                    usuario=self.request.user,
-                    data_vencimento=current_date
-                ).aggregate(total=Sum('valor'))['total'] or 0
-                
-                despesas_dia = Despesa.objects.filter(
-                    usuario=self.request.user,
-                    data_despesa=current_date
-                ).aggregate(total=Sum('valor'))['total'] or 0
-                
-                dados['receitas'].append(float(receitas_dia))
-                dados['despesas'].append(float(despesas_dia))
-                dados['lucro'].append(float(receitas_dia - despesas_dia))
-                
-                current_date += timedelta(days=1)
-        else:  # Dados mensais
-            current_date = filtros['data_inicial'].replace(day=1)
-            while current_date <= filtros['data_final']:
+                next_date = current_date + timedelta(days=1)
+            else:
+                dados['labels'].append(current_date.strftime('%m/%Y'))
                 if current_date.month == 12:
-                    next_month = current_date.replace(year=current_date.year + 1, month=1)
+                    next_date = current_date.replace(year=current_date.year + 1, month=1)
                 else:
-                    next_month = current_date.replace(month=current_date.month + 1)
-                
-                fim_mes = min(next_month - timedelta(days=1), filtros['data_final'])
-                
-                dados['labels'].append(current_date.strftime('%m/%Y'))
-                
-                receitas_mes = Honorario.objects.filter(
-                    usuario=self.request.user,
-                    data_vencimento__range=[current_date, fim_mes]
-                ).aggregate(total=Sum('valor'))['total'] or 0
-                
-                despesas_mes = Despesa.objects.filter(
-                    usuario=self.request.user,
-                    data_despesa__range=[current_date, fim_mes]
-                ).aggregate(total=Sum('valor'))['total'] or 0
-                
-                dados['receitas'].append(float(receitas_mes))
-                dados['despesas'].append(float(despesas_mes))
-                dados['lucro'].append(float(receitas_mes - despesas_mes))
-                
-                current_date = next_month
+                    next_date = current_date.replace(month=current_date.month + 1)
+            
+            receitas_periodo = receitas.get(current_date, 0.0)
+            despesas_periodo = despesas.get(current_date, 0.0)
+            dados['receitas'].append(receitas_periodo)
+            dados['despesas'].append(despesas_periodo)
+            dados['lucro'].append(receitas_periodo - despesas_periodo)
+            
+            current_date = next_date
         
         return dados
     
+    def _somar_por_periodo(self, queryset, campo_data, diario):
+        """Soma 'valor' por dia ou por mês, já convertida para float pelo banco"""
+        periodo = F(campo_data) if diario else TruncMonth(campo_data)
+        return dict(
+            queryset.annotate(periodo=periodo)
+            .values('periodo')
+            .annotate(total=Cast(Sum('valor'), FloatField()))
+            .order_by()
+            .values_list('periodo', 'total')
+        )
+    
     def _get_top_clientes(self, filtros):
         """Gera dados para o gráfico de top clientes"""
         top_clientes = Honorario.objects.filter(
             usuario=self.request.user,
             data_vencimento__range=[filtros['data_inicial'], filtros['data_final']]
         ).values('cliente__nome_razao_social').annotate(
-            total=Sum('valor')
+            total=Cast(Sum('valor'), FloatField())
         ).order_by('-total')[:5]
         
         return {
             'labels': [cliente['cliente__nome_razao_social'][:20] for cliente in top_clientes],
-            'valores': [float(cliente['total']) for cliente in top_clientes]
+            'valores': [cliente['total'] for cliente in top_clientes]
         }
     
     def _get_despesas_categoria(self, filtros):
@@ -528,17 +550,13 @@ class RelatorioFinanceiroView(LoginRequiredMixin, TemplateView):
             usuario=self.request.user,
             data_despesa__range=[filtros['data_inicial'], filtros['data_final']]
         ).values('tipo_despesa').annotate(
-            total=Sum('valor')
+            total=Cast(Sum('valor'), FloatField())
         ).order_by('-total')
         
         return {
             'labels': [despesa['tipo_despesa'] for despesa in despesas_categoria],
-            'valores': [float(despesa['total']) for despesa in despesas_categoria]
+            'valores': [despesa['total'] for despesa in despesas_categoria]
         }
-    
-    def _get_periodo_filtro(self, filtros):
-        # Mesmo método da view de processos
-        return RelatorioProcessosView()._get_periodo_filtro(filtros)
 
 
 class RelatorioProdutividadeView(LoginRequiredMixin, TemplateView):
@@ -566,7 +584,7 @@ class RelatorioProdutividadeView(LoginRequiredMixin, TemplateView):
         
         if form.is_valid():
             # Aplicar filtros de período
-            data_inicio, data_fim = self._get_periodo_filtro(form.cleaned_data)
+            data_inicio, data_fim = resolve_periodo(form.cleaned_data)
             if data_inicio:
                 processos_qs = processos_qs.filter(data_inicio__gte=data_inicio)
                 andamentos_qs = andamentos_qs.filter(data__gte=data_inicio)
@@ -587,49 +605,75 @@ class RelatorioProdutividadeView(LoginRequiredMixin, TemplateView):
             from django.contrib.auth import get_user_model
             User = get_user_model()
             
-            usuarios = User.objects.filter(is_active=True)
-            for usuario in usuarios:
-                processos_usuario = processos_qs.filter(responsavel=usuario).count()
-                andamentos_usuario = andamentos_qs.filter(processo__responsavel=usuario).count()
-                documentos_usuario = documentos_qs.filter(processo__responsavel=usuario).count()
-                
-                if processos_usuario > 0 or andamentos_usuario > 0 or documentos_usuario > 0:
-                    produtividade_usuarios.append({
-                        'usuario': f"{usuario.first_name} {usuario.last_name}".strip() or usuario.username,
-                        'processos': processos_usuario,
-                        'andamentos': andamentos_usuario,
-                        'documentos': documentos_usuario,
-                        'total_atividades': processos_usuario + andamentos_usuario + documentos_usuario
-                    })
+            # Contagens agrupadas por responsável: uma consulta por tipo de atividade
+            processos_por_usuario = dict(
+                processos_qs.values_list('responsavel').annotate(total=Count('id')).order_by()
+            )
+            andamentos_por_usuario = dict(
+                andamentos_qs.values_list('processo__responsavel').annotate(total=Count('id')).order_by()
+            )
+            documentos_por_usuario = dict(
+                documentos_qs.values_list('processo__responsavel').annotate(total=Count('id')).order_by()
+            )
             
-            produtividade_usuarios.sort(key=lambda x: x['total_atividades'], reverse=True)
-        
-        # Atividades por dia da semana
+            totais = Counter(processos_por_usuario)
+            totais.update(andamentos_por_usuario)
+            totais.update(documentos_por_usuario)
+            totais.pop(None, None)
+            
+            # Apenas usuários ativos com alguma atividade; os 10 maiores totais
+            usuarios = User.objects.filter(is_active=True, id__in=list(totais)).only(
+                'id', 'username', 'first_name', 'last_name'
+            ).in_bulk()
+            top_usuarios = heapq.nlargest(
+                10, (item for item in totais.items() if item[0] in usuarios), key=itemgetter(1)
+            )
+            
+            for usuario_id, total_atividades in top_usuarios:
+                usuario = usuarios[usuario_id]
+                produtividade_usuarios.append({
+                    'usuario': f"{usuario.first_name} {usuario.last_name}".strip() or usuario.username,
+                    'processos': processos_por_usuario.get(usuario_id, 0),
+                    'andamentos': andamentos_por_usuario.get(usuario_id, 0),
+                    'documentos': documentos_por_usuario.get(usuario_id, 0),
+                    'total_atividades': total_atividades
+                })
+        
+        # Atividades por dia da semana e tipos de andamento: uma única consulta
+        # agrupada por (dia da semana, tipo), consolidada nas duas dimensões
         atividades_semana = [0] * 7  # Segunda a domingo
-        for andamento in andamentos_qs:
-            dia_semana = andamento.data.weekday()  # 0=segunda, 6=domingo
-            atividades_semana[dia_semana] += 1
+        totais_por_tipo = Counter()
+        contagens = (
+            andamentos_qs.annotate(dia_semana=ExtractIsoWeekDay('data'))  # 1=segunda, 7=domingo
+            .values_list('dia_semana', 'tipo_andamento__nome')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        for dia_semana, tipo, total in contagens:
+            atividades_semana[dia_semana - 1] += total
+            totais_por_tipo[tipo] += total
+        
+        # Evolução de atividades por mês (últimos 12 meses, uma consulta por modelo)
+        meses = _ultimos_meses(12)
+        processos_por_mes = dict(
+            processos_qs.filter(data_inicio__gte=meses[0])
+            .annotate(mes=TruncMonth('data_inicio'))
+            .values_list('mes')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        andamentos_por_mes = dict(
+            andamentos_qs.filter(data__gte=meses[0])
+            .annotate(mes=TruncMonth('data'))
+            .values_list('mes')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
         
-        # Evolução de atividades por mês
         atividades_por_mes = []
-        for i in range(12):
-            mes = date.today() - timedelta(days=30*i)
-            inicio_mes = mes.replace(day=1)
-            if mes.month == 12:
-                fim_mes = mes.replace(year=mes.year+1, month=1, day=1) - timedelta(days=1)
-            else:
-                fim_mes = mes.replace(month=mes.month+1, day=1) - timedelta(days=1)
-            
-            processos_mes = processos_qs.filter(
-                data_inicio__gte=inicio_mes,
-                data_inicio__lte=fim_mes
-            ).count()
-            
-            andamentos_mes = andamentos_qs.filter(
-                data__gte=inicio_mes,
-                data__lte=fim_mes
-            ).count()
-            
+        for mes in meses:
+            processos_mes = processos_por_mes.get(mes, 0)
+            andamentos_mes = andamentos_por_mes.get(mes, 0)
             atividades_por_mes.append({
                 'mes': mes.strftime('%m/%Y'),
                 'processos': processos_mes,
@@ -637,30 +681,23 @@ class RelatorioProdutividadeView(LoginRequiredMixin, TemplateView):
                 'total': processos_mes + andamentos_mes
             })
         
-        atividades_por_mes.reverse()
-        
         # Tipos de andamento mais frequentes
-        tipos_andamento = list(
-            andamentos_qs.values('tipo_andamento__nome')
-            .annotate(total=Count('id'))
-            .order_by('-total')[:10]
-        )
+        tipos_andamento = [
+            {'tipo_andamento__nome': tipo, 'total': total}
+            for tipo, total in totais_por_tipo.most_common(10)
+        ]
         
         context.update({
             'total_processos': total_processos,
             'total_andamentos': total_andamentos,
             'total_documentos': total_documentos,
-            'produtividade_usuarios': produtividade_usuarios[:10],
-            'atividades_semana': json.dumps(atividades_semana),
-            'atividades_por_mes': json.dumps(atividades_por_mes),
+            'produtividade_usuarios': produtividade_usuarios,
+            'atividades_semana': atividades_semana,
+            'atividades_por_mes': atividades_por_mes,
             'tipos_andamento': tipos_andamento,
         })
         
         return context
-    
-    def _get_periodo_filtro(self, filtros):
-        # Mesmo método da view de processos
-        return RelatorioProcessosView()._get_periodo_filtro(filtros)
 
 
 # Views para Templates de Relatórios
@@ -747,12 +784,15 @@ class DashboardPersonalizadoListView(LoginRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
+        queryset = DashboardPersonalizado.objects.only(
+            'id', 'nome', 'usuario_id', 'publico', 'created_at', 'updated_at'
+        )
         if self.request.user.is_staff:
-            return DashboardPersonalizado.objects.all().order_by('-data_criacao')
-        else:
-            return DashboardPersonalizado.objects.filter(
-                Q(usuario=self.request.user) | Q(publico=True)
-            ).order_by('-data_criacao')
+            return queryset.order_by('-created_at')
+        # Dois lookups indexados em vez de um OR; o exclude evita duplicatas sem DISTINCT
+        proprios = queryset.filter(usuario=self.request.user).order_by()
+        publicos = queryset.filter(publico=True).exclude(usuario=self.request.user).order_by()
+        return proprios.union(publicos, all=True).order_by('-created_at')
 
 
 class DashboardPersonalizadoCreateView(LoginRequiredMixin, CreateView):
@@ -779,12 +819,12 @@ class DashboardPersonalizadoDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'dashboard'
     
     def get_queryset(self):
+        queryset = DashboardPersonalizado.objects.only(
+            'id', 'nome', 'usuario_id', 'publico', 'configuracao_widgets', 'layout'
+        )
         if self.request.user.is_staff:
-            return DashboardPersonalizado.objects.all()
-        else:
-            return DashboardPersonalizado.objects.filter(
-                Q(usuario=self.request.user) | Q(publico=True)
-            )
+            return queryset
+        return queryset.filter(Q(usuario=self.request.user) | Q(publico=True))
 
 
 # Views para Execução de Relatórios
@@ -800,47 +840,23 @@ def executar_relatorio(request, template_id):
         raise Http404("Template não encontrado")
     
     if request.method == 'POST':
-        form = FiltroRelatorioForm(request.POST, user=request.user, tipo_relatorio=template.tipo)
+        form = FiltroRelatorioForm(request.POST, user=request.user, tipo_relatorio=template.tipo_relatorio)
         
         if form.is_valid():
-            # Criar execução do relatório
+            from .tasks import executar_relatorio_task
+            
+            # Criar execução do relatório e gerar os dados no worker
             execucao = ExecucaoRelatorio.objects.create(
                 template=template,
                 usuario=request.user,
-                parametros_execucao=form.cleaned_data,
+                parametros_execucao=serializar_filtros(form.cleaned_data),
                 status='processando'
             )
+            executar_relatorio_task.delay(str(execucao.id))
             
-            try:
-                # Gerar dados do relatório
-                dados = _gerar_dados_relatorio(template, form.cleaned_data, request.user)
-                
-                # Atualizar execução
-                execucao.status = 'concluido'
-                execucao.data_conclusao = timezone.now()
-                execucao.total_registros = len(dados.get('registros', []))
-                execucao.save()
-                
-                # Renderizar relatório
-                context = {
-                    'template': template,
-                    'execucao': execucao,
-                    'dados': dados,
-                    'form': form
-                }
-                
-                return render(request, 'relatorios/resultado.html', context)
-                
-            except Exception as e:
-                execucao.status = 'erro'
-                execucao.mensagem_erro = str(e)
-                execucao.data_conclusao = timezone.now()
-                execucao.save()
-                
-                messages.error(request, f'Erro ao executar relatório: {str(e)}')
-                return redirect('relatorios:dashboard')
+            return redirect('relatorios:execucao_resultado', execucao_id=execucao.id)
     else:
-        form = FiltroRelatorioForm(user=request.user, tipo_relatorio=template.tipo)
+        form = FiltroRelatorioForm(user=request.user, tipo_relatorio=template.tipo_relatorio)
     
     context = {
         'template': template,
@@ -850,192 +866,52 @@ def executar_relatorio(request, template_id):
     return render(request, 'relatorios/executar.html', context)
 
 
-def _gerar_dados_relatorio(template, filtros, usuario):
+@login_required
+def execucao_resultado(request, execucao_id):
     """
-    Gera os dados do relatório baseado no template e filtros
+    Exibe o resultado de uma execução, ou acompanha seu processamento
     """
-    dados = {
-        'registros': [],
-        'estatisticas': {},
-        'graficos': []
-    }
-    
-    # Aplicar filtros de período
-    data_inicio, data_fim = _get_periodo_filtro_helper(filtros)
-    
-    if template.tipo == 'processos':
-        # Base queryset
-        if usuario.is_staff:
-            qs = Processo.objects.all()
-        else:
-            qs = Processo.objects.filter(responsavel=usuario)
-        
-        # Aplicar filtros
-        if data_inicio:
-            qs = qs.filter(data_inicio__gte=data_inicio)
-        if data_fim:
-            qs = qs.filter(data_inicio__lte=data_fim)
-        
-        # Aplicar outros filtros específicos
-        if filtros.get('tipo_processo'):
-            qs = qs.filter(tipo_processo=filtros['tipo_processo'])
-        if filtros.get('area_direito'):
-            qs = qs.filter(area_direito=filtros['area_direito'])
-        if filtros.get('status_processo'):
-            qs = qs.filter(status=filtros['status_processo'])
-        
-        # Selecionar campos baseado no template
-        campos_selecionados = template.campos_selecionados or []
-        
-        # Gerar registros
-        for processo in qs.select_related('cliente', 'area_direito', 'responsavel'):
-            registro = {}
-            
-            if 'numero_processo' in campos_selecionados:
-                registro['numero_processo'] = processo.numero_processo
-            if 'cliente' in campos_selecionados:
-                registro['cliente'] = str(processo.cliente)
-            if 'tipo_processo' in campos_selecionados:
-                registro['tipo_processo'] = str(processo.tipo_processo)
-            if 'area_direito' in campos_selecionados:
-                registro['area_direito'] = str(processo.area_direito)
-            if 'status' in campos_selecionados:
-                registro['status'] = processo.get_status_display()
-            if 'data_inicio' in campos_selecionados:
-                registro['data_inicio'] = processo.data_inicio
-            if 'valor_causa' in campos_selecionados:
-                registro['valor_causa'] = processo.valor_causa
-            if 'responsavel' in campos_selecionados:
-                registro['responsavel'] = str(processo.responsavel)
-            
-            dados['registros'].append(registro)
-        
-        # Estatísticas
-        dados['estatisticas'] = {
-            'total_processos': qs.count(),
-            'processos_ativos': qs.filter(status='ativo').count(),
-            'processos_encerrados': qs.filter(status='encerrado').count(),
-            'valor_total_causas': qs.aggregate(Sum('valor_causa'))['valor_causa__sum'] or Decimal('0.00')
-        }
+    execucao = get_object_or_404(
+        ExecucaoRelatorio.objects.select_related('template', 'usuario'),
+        id=execucao_id, usuario=request.user
+    )
     
-    elif template.tipo == 'clientes':
-        # Implementar lógica para relatório de clientes
-        # Obter todos os clientes
-        qs = Cliente.objects.all()
-        
-        # Aplicar filtros de período
-        if data_inicio:
-            qs = qs.filter(created_at__date__gte=data_inicio)
-        if data_fim:
-            qs = qs.filter(created_at__date__lte=data_fim)
-        
-        # Gerar registros
-        campos_selecionados = template.campos_selecionados or []
-        
-        for cliente in qs:
-            registro = {}
-            
-            if 'nome' in campos_selecionados:
-                registro['nome'] = cliente.nome
-            if 'tipo_pessoa' in campos_selecionados:
-                registro['tipo_pessoa'] = cliente.get_tipo_pessoa_display()
-            if 'documento' in campos_selecionados:
-                registro['documento'] = cliente.cpf_cnpj
-            if 'email' in campos_selecionados:
-                registro['email'] = cliente.email
-            if 'telefone' in campos_selecionados:
-                registro['telefone'] = cliente.telefone
-            if 'data_cadastro' in campos_selecionados:
-                registro['data_cadastro'] = cliente.created_at
-            
-            dados['registros'].append(registro)
-        
-        # Estatísticas
-        dados['estatisticas'] = {
-            'total_clientes': qs.count(),
-            'clientes_pf': qs.filter(tipo_pessoa='PF').count(),
-            'clientes_pj': qs.filter(tipo_pessoa='PJ').count(),
-            'clientes_ativos': qs.filter(ativo=True).count()
-        }
+    # Apenas a prévia gravada pelo worker; o relatório completo sai na exportação
+    dados = execucao.resultado if execucao.status == 'concluido' else None
+    registros_exibidos = len(dados.get('registros', [])) if dados is not None else 0
     
-    elif template.tipo == 'financeiro':
-        # Implementar lógica para relatório financeiro
-        # Obter todos os honorários e despesas
-        honorarios_qs = Honorario.objects.all()
-        despesas_qs = Despesa.objects.all()
-        
-        # Aplicar filtros de período
-        if data_inicio:
-            honorarios_qs = honorarios_qs.filter(data_vencimento__gte=data_inicio)
-            despesas_qs = despesas_qs.filter(data_vencimento__gte=data_inicio)
-        if data_fim:
-            honorarios_qs = honorarios_qs.filter(data_vencimento__lte=data_fim)
-            despesas_qs = despesas_qs.filter(data_vencimento__lte=data_fim)
-        
-        # Combinar honorários e despesas
-        campos_selecionados = template.campos_selecionados or []
-        
-        # Honorários
-        for honorario in honorarios_qs.select_related('processo', 'processo__cliente'):
-            registro = {'tipo': 'Honorário'}
-            
-            if 'processo' in campos_selecionados:
-                registro['processo'] = honorario.processo.numero_processo
-            if 'cliente' in campos_selecionados:
-                registro['cliente'] = str(honorario.processo.cliente)
-            if 'valor' in campos_selecionados:
-                registro['valor'] = honorario.valor_total
-            if 'data_vencimento' in campos_selecionados:
-                registro['data_vencimento'] = honorario.data_vencimento
-            if 'status' in campos_selecionados:
-                registro['status'] = honorario.get_status_display()
-            
-            dados['registros'].append(registro)
-        
-        # Despesas
-        for despesa in despesas_qs.select_related('processo', 'processo__cliente', 'tipo_despesa'):
-            registro = {'tipo': 'Despesa'}
-            
-            if 'processo' in campos_selecionados:
-                registro['processo'] = despesa.processo.numero_processo
-            if 'cliente' in campos_selecionados:
-                registro['cliente'] = str(despesa.processo.cliente)
-            if 'valor' in campos_selecionados:
-                registro['valor'] = despesa.valor
-            if 'data_vencimento' in campos_selecionados:
-                registro['data_vencimento'] = despesa.data_vencimento
-            if 'descricao' in campos_selecionados:
-                registro['descricao'] = despesa.descricao
-            
-            dados['registros'].append(registro)
-        
-        # Estatísticas
-        total_honorarios = honorarios_qs.aggregate(Sum('valor_total'))['valor_total__sum'] or Decimal('0.00')
-        total_despesas = despesas_qs.aggregate(Sum('valor'))['valor__sum'] or Decimal('0.00')
-        
-        dados['estatisticas'] = {
-            'total_honorarios': total_honorarios,
-            'total_despesas': total_despesas,
-            'saldo': total_honorarios - total_despesas,
-            'honorarios_pendentes': honorarios_qs.filter(status='pendente').count(),
-            'despesas_pendentes': despesas_qs.filter(reembolsada=False).count()
-        }
+    context = {
+        'template': execucao.template,
+        'execucao': execucao,
+        'dados': dados,
+        'registros_exibidos': registros_exibidos,
+        'registros_truncados': dados is not None and execucao.total_registros > registros_exibidos,
+    }
     
-    return dados
+    return render(request, 'relatorios/execucoes/resultado.html', context)
 
 
-def _get_periodo_filtro_helper(filtros):
+@login_required
+def execucao_status(request, execucao_id):
     """
-    Helper para converter período em datas
+    Retorna o status de uma execução para acompanhamento via AJAX
     """
-    return RelatorioProcessosView()._get_periodo_filtro(filtros)
+    execucao = get_object_or_404(ExecucaoRelatorio, id=execucao_id, usuario=request.user)
+    
+    return JsonResponse({
+        'status': execucao.status,
+        'total_registros': execucao.total_registros,
+        'erro': execucao.mensagem_erro,
+    })
+
+
 
 
 # Views de Exportação
 @login_required
 def exportar_relatorio(request, execucao_id):
     """
-    Exporta um relatório executado em diferentes formatos
+    Enfileira a exportação de um relatório executado em diferentes formatos
     """
     execucao = get_object_or_404(ExecucaoRelatorio, id=execucao_id, usuario=request.user)
     
@@ -1043,23 +919,27 @@ def exportar_relatorio(request, execucao_id):
         form = ExportarRelatorioForm(request.POST)
         
         if form.is_valid():
-            formato = form.cleaned_data['formato']
-            
-            # Regenerar dados do relatório
-            dados = _gerar_dados_relatorio(
-                execucao.template,
-                execucao.parametros_execucao,
-                request.user
-            )
+            from .tasks import run_relatorio_export
             
-            if formato == 'pdf':
-                return _exportar_pdf(execucao, dados, form.cleaned_data)
-            elif formato == 'excel':
-                return _exportar_excel(execucao, dados, form.cleaned_data)
-            elif formato == 'csv':
-                return _exportar_csv(execucao, dados, form.cleaned_data)
-            else:
+            formato = form.cleaned_data['formato']
+            if formato not in FORMATOS_EXPORTACAO:
                 messages.error(request, 'Formato de exportação inválido.')
+            else:
+                # A tarefa fica registrada na execução antes de ser enfileirada,
+                # para que o status só seja consultado pelo dono da execução
+                task_id = str(uuid.uuid4())
+                execucao.tarefa_exportacao = task_id
+                execucao.save(update_fields=['tarefa_exportacao'])
+                
+                # Geração do arquivo ocorre no worker, liberando a requisição
+                run_relatorio_export.apply_async(
+                    args=(request.user.pk, str(execucao.id), formato, form.cleaned_data),
+                    task_id=task_id
+                )
+                return JsonResponse({
+                    'task_id': task_id,
+                    'status_url': reverse('relatorios:exportar_status', args=[task_id]),
+                }, status=202)
     else:
         form = ExportarRelatorioForm()
     
@@ -1068,24 +948,120 @@ def exportar_relatorio(request, execucao_id):
         'form': form
     }
     
-    return render(request, 'relatorios/exportar.html', context)
+    return render(request, 'relatorios/execucoes/exportar.html', context)
 
 
-def _exportar_pdf(execucao, dados, opcoes):
+@login_required
+def exportar_relatorio_csv(request, execucao_id):
     """
-    Exporta relatório em formato PDF
+    Exporta um relatório executado em CSV via streaming, linha a linha
     """
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="relatorio_{execucao.id}.pdf"'
+    execucao = get_object_or_404(
+        ExecucaoRelatorio.objects.select_related('template', 'usuario'),
+        id=execucao_id, usuario=request.user
+    )
+    dados = dados_execucao(execucao)
     
+    writer = csv.writer(EcoBuffer())
+    response = StreamingHttpResponse(
+        (writer.writerow(linha) for linha in _linhas_csv(execucao, dados)),
+        content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="relatorio_{execucao.id}.csv"'
+    return response
+
+
+@login_required
+def exportar_relatorio_status(request, task_id):
+    """
+    Retorna o estado de uma exportação enfileirada e a URL de download quando pronta
+    """
+    from celery.result import AsyncResult
+    
+    # Apenas exportações das execuções do próprio usuário
+    execucao = get_object_or_404(
+        ExecucaoRelatorio, tarefa_exportacao=task_id, usuario=request.user
+    )
+    
+    resultado = AsyncResult(task_id)
+    resposta = {'task_id': task_id, 'status': resultado.state}
+    
+    if resultado.successful():
+        resposta['download_url'] = execucao.arquivo_gerado.url
+    elif resultado.failed():
+        resposta['erro'] = str(resultado.result)
+    
+    return JsonResponse(resposta)
+
+
+def _cabecalhos_e_registros(registros):
+    """
+    Retorna os cabeçalhos (chaves do primeiro registro) e um iterador sobre
+    todos os registros, sem materializar geradores
+    """
+    registros = iter(registros)
+    primeiro = next(registros, None)
+    if primeiro is None:
+        return [], iter(())
+    return list(primeiro.keys()), chain([primeiro], registros)
+
+
+# Estilos do PDF, montados uma única vez na carga do módulo
+_PDF_STYLES = getSampleStyleSheet()
+
+_PDF_INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+_PDF_DATA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 7),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+
+def _valores_linha(headers):
+    """
+    Retorna uma função que extrai, como texto, os valores dos cabeçalhos de um
+    registro. Usa itemgetter e só recorre a .get() quando falta alguma chave
+    (ex.: honorários e despesas no mesmo relatório).
+    """
+    getter = itemgetter(*headers)
+    unico = len(headers) == 1
+    
+    def valores(registro):
+        try:
+            extraidos = getter(registro)
+        except KeyError:
+            return [str(registro.get(header, '')) for header in headers]
+        return [str(extraidos)] if unico else list(map(str, extraidos))
+    
+    return valores
+
+
+def _exportar_pdf(execucao, dados, opcoes, destino):
+    """
+    Exporta relatório em formato PDF
+    """
     # Criar documento PDF
-    doc = SimpleDocTemplate(response, pagesize=A4)
+    doc = SimpleDocTemplate(destino, pagesize=A4)
     story = []
-    styles = getSampleStyleSheet()
     
     # Título
     titulo = opcoes.get('titulo_personalizado') or f"Relatório: {execucao.template.nome}"
-    story.append(Paragraph(titulo, styles['Title']))
+    story.append(Paragraph(titulo, _PDF_STYLES['Title']))
     story.append(Spacer(1, 12))
     
     # Informações do relatório
@@ -1096,145 +1072,138 @@ def _exportar_pdf(execucao, dados, opcoes):
     ]
     
     info_table = Table(info_data)
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-    ]))
+    info_table.setStyle(_PDF_INFO_TABLE_STYLE)
     
     story.append(info_table)
     story.append(Spacer(1, 12))
     
     # Dados do relatório
-    if dados['registros']:
+    headers, registros = _cabecalhos_e_registros(dados['registros'])
+    if headers:
         # Cabeçalhos da tabela
-        headers = list(dados['registros'][0].keys())
         table_data = [headers]
         
-        # Dados
-        for registro in dados['registros'][:100]:  # Limitar a 100 registros
-            row = [str(registro.get(header, '')) for header in headers]
-            table_data.append(row)
+        # Dados (limite opcional de linhas, configurável em settings)
+        limite = getattr(settings, 'RELATORIOS_PDF_MAX_REGISTROS', None)
+        valores = _valores_linha(headers)
+        table_data.extend(map(valores, islice(registros, limite)))
         
         # Criar tabela
-        table = Table(table_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table = Table(table_data, repeatRows=1)
+        table.setStyle(_PDF_DATA_TABLE_STYLE)
         
         story.append(table)
+        
+        if next(registros, None) is not None:
+            story.append(Spacer(1, 12))
+            story.append(Paragraph(
+                f"Exibindo os primeiros {limite} registros. Exporte em Excel ou CSV para a lista completa.",
+                _PDF_STYLES['Italic']
+            ))
     
     # Construir PDF
     doc.build(story)
-    
-    return response
 
 
-def _exportar_excel(execucao, dados, opcoes):
+# Estilos do Excel, criados uma única vez na carga do módulo
+_EXCEL_TITLE_FONT = Font(bold=True, size=14)
+_EXCEL_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_EXCEL_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+
+
+def _exportar_excel(execucao, dados, opcoes, destino):
     """
     Exporta relatório em formato Excel
     """
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="relatorio_{execucao.id}.xlsx"'
+    # Workbook em modo write_only: as linhas são gravadas à medida que chegam
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Relatório")
     
-    # Criar workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Relatório"
+    headers, registros = _cabecalhos_e_registros(dados['registros'])
     
-    # Estilos
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    # Largura das colunas estimada pelos cabeçalhos (precisa vir antes das linhas)
+    for col, header in enumerate(headers, 1):
+        ws.column_dimensions[get_column_letter(col)].width = max(len(header) + 2, 12)
     
     # Título
     titulo = opcoes.get('titulo_personalizado') or f"Relatório: {execucao.template.nome}"
-    ws['A1'] = titulo
-    ws['A1'].font = Font(bold=True, size=14)
+    titulo_cell = WriteOnlyCell(ws, value=titulo)
+    titulo_cell.font = _EXCEL_TITLE_FONT
+    ws.append([titulo_cell])
+    ws.append([])
     
     # Informações do relatório
-    ws['A3'] = "Template:"
-    ws['B3'] = execucao.template.nome
-    ws['A4'] = "Executado em:"
-    ws['B4'] = execucao.data_execucao.strftime('%d/%m/%Y %H:%M')
-    ws['A5'] = "Total de registros:"
-    ws['B5'] = execucao.total_registros
+    ws.append(["Template:", execucao.template.nome])
+    ws.append(["Executado em:", execucao.data_execucao.strftime('%d/%m/%Y %H:%M')])
+    ws.append(["Total de registros:", execucao.total_registros])
     
     # Dados do relatório
-    if dados['registros']:
-        start_row = 7
+    if headers:
+        ws.append([])
         
         # Cabeçalhos
-        headers = list(dados['registros'][0].keys())
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=start_row, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = _EXCEL_HEADER_FONT
+            cell.fill = _EXCEL_HEADER_FILL
+            header_cells.append(cell)
+        ws.append(header_cells)
         
         # Dados
-        for row_idx, registro in enumerate(dados['registros'], start_row + 1):
-            for col_idx, header in enumerate(headers, 1):
-                ws.cell(row=row_idx, column=col_idx, value=str(registro.get(header, '')))
-        
-        # Ajustar largura das colunas
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        valores = _valores_linha(headers)
+        for registro in registros:
+            ws.append(valores(registro))
     
     # Salvar workbook
-    wb.save(response)
-    
-    return response
+    wb.save(destino)
 
 
-def _exportar_csv(execucao, dados, opcoes):
+class EcoBuffer:
     """
-    Exporta relatório em formato CSV
+    Pseudo-arquivo cujo write devolve o texto recebido, usado para o
+    csv.writer alimentar um StreamingHttpResponse
     """
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="relatorio_{execucao.id}.csv"'
-    
-    writer = csv.writer(response)
     
+    def write(self, valor):
+        return valor
+
+
+def _linhas_csv(execucao, dados):
+    """
+    Gera as linhas do CSV: informações do relatório, cabeçalhos e registros
+    """
     # Cabeçalho com informações do relatório
-    writer.writerow([f"Relatório: {execucao.template.nome}"])
-    writer.writerow([f"Executado em: {execucao.data_execucao.strftime('%d/%m/%Y %H:%M')}"])
-    writer.writerow([f"Total de registros: {execucao.total_registros}"])
-    writer.writerow([])  # Linha em branco
+    yield [f"Relatório: {execucao.template.nome}"]
+    yield [f"Executado em: {execucao.data_execucao.strftime('%d/%m/%Y %H:%M')}"]
+    yield [f"Total de registros: {execucao.total_registros}"]
+    yield []  # Linha em branco
     
     # Dados do relatório
-    if dados['registros']:
-        # Cabeçalhos
-        headers = list(dados['registros'][0].keys())
-        writer.writerow(headers)
-        
-        # Dados
-        for registro in dados['registros']:
-            row = [str(registro.get(header, '')) for header in headers]
-            writer.writerow(row)
+    headers, registros = _cabecalhos_e_registros(dados['registros'])
+    if headers:
+        yield headers
+        yield from map(_valores_linha(headers), registros)
+
+
+def _exportar_csv(execucao, dados, opcoes, destino):
+    """
+    Exporta relatório em formato CSV
+    """
+    texto = io.TextIOWrapper(destino, encoding='utf-8', newline='')
+    csv.writer(texto).writerows(_linhas_csv(execucao, dados))
     
-    return response
+    # Liberar o buffer binário sem fechá-lo
+    texto.flush()
+    texto.detach()
+
+
+# Formato -> (exportador, extensão do arquivo gerado)
+FORMATOS_EXPORTACAO = {
+    'pdf': (_exportar_pdf, 'pdf'),
+    'excel': (_exportar_excel, 'xlsx'),
+    'csv': (_exportar_csv, 'csv'),
+}
 
 # Filtros Avançados
 from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView
@@ -1326,32 +1295,29 @@ class ExecutarRelatorioView(TemplateView):
         return context
 
     def post(self, request, *args, **kwargs):
-        from django.shortcuts import render, redirect, get_object_or_404
+        from django.shortcuts import redirect, get_object_or_404
         from django.contrib import messages
         from .forms import FiltroRelatorioForm
         from .models import TemplateRelatorio
-        from .services import executar_relatorio_service
+        from .tasks import executar_relatorio_task
 
         template_id = request.POST.get('template_id')
         template = get_object_or_404(TemplateRelatorio, id=template_id)
 
-        form = FiltroRelatorioForm(request.POST, user=request.user, tipo_relatorio=template.tipo)
+        form = FiltroRelatorioForm(request.POST, user=request.user, tipo_relatorio=template.tipo_relatorio)
         if not form.is_valid():
             messages.error(request, 'Parâmetros inválidos para execução do relatório.')
             return self.get(request, *args, **kwargs)
 
-        try:
-            execucao, dados = executar_relatorio_service(template, request.user, form.cleaned_data)
-            context = {
-                'template': template,
-                'execucao': execucao,
-                'dados': dados,
-                'form': form,
-            }
-            return render(request, 'relatorios/resultado.html', context)
-        except Exception as e:
-            messages.error(request, f'Erro ao executar relatório: {str(e)}')
-            return redirect('relatorios:dashboard')
+        # A geração ocorre no worker; a página de resultado acompanha o status
+        execucao = ExecucaoRelatorio.objects.create(
+            template=template,
+            usuario=request.user,
+            parametros_execucao=serializar_filtros(form.cleaned_data),
+            status='processando'
+        )
+        executar_relatorio_task.delay(str(execucao.id))
+        return redirect('relatorios:execucao_resultado', execucao_id=execucao.id)
 
 
 class ListaExecucoesView(LoginRequiredMixin, ListView):
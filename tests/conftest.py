@@ -1,25 +1,34 @@
 """
 Configurações e fixtures para pytest
 """
+import copy
 import pytest
-import os
-import django
-from django.conf import settings
 
-# Configurar Django ANTES de importar qualquer coisa do Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'plataforma_juridica.settings.test')
-django.setup()
-
-# Agora podemos importar com segurança
 from django.test import Client
+from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connection, transaction
 from rest_framework.test import APIClient
 
+try:
+    from zeal import zeal_context
+except ImportError:  # django-zeal é opcional (requirements-dev.txt)
+    zeal_context = None
+
+try:
+    from freezegun import freeze_time
+except ImportError:  # freezegun é opcional (requirements-dev.txt)
+    freeze_time = None
+
+# Data fixa da sessão de testes: date.today() e timezone.now() são
+# determinísticos entre execuções (sem virada de dia no meio da suíte)
+DATA_CONGELADA = '2024-01-15 12:00:00'
+
 from tests.factories import (
     UserFactory, AdminUserFactory, ClienteFactory, ProcessoFactory,
-    ClienteCompletoFactory, ProcessoCompletoFactory
+    ClienteCompletoFactory, ProcessoCompletoFactory, _get_tipo_doc
 )
 
 User = get_user_model()
@@ -31,20 +40,69 @@ def django_db_setup(django_db_setup, django_db_blocker):
     Configuração inicial do banco de dados para testes
     """
     with django_db_blocker.unblock():
-        # Executar migrações se necessário
-        call_command('migrate', '--run-syncdb')
+        # Executar migrações apenas se faltar alguma tabela (ex.: banco reaproveitado)
+        existentes = set(connection.introspection.table_names())
+        if not set(connection.introspection.django_table_names()) <= existentes:
+            call_command('migrate', '--run-syncdb')
+
+
+# Usuários compartilhados pela sessão: criados uma vez fora da transação de cada
+# teste. Alterações feitas dentro de um teste sofrem rollback, e os wrappers
+# abaixo recarregam a instância para que cada teste receba o estado gravado.
+@pytest.fixture(scope='session')
+def _shared_user(django_db_setup, django_db_blocker):
+    """Usuário comum criado uma única vez por sessão"""
+    with django_db_blocker.unblock():
+        usuario = UserFactory()
+    yield usuario
+    with django_db_blocker.unblock():
+        usuario.delete()
+
+
+@pytest.fixture(scope='session')
+def _shared_admin_user(django_db_setup, django_db_blocker):
+    """Usuário administrador criado uma única vez por sessão"""
+    with django_db_blocker.unblock():
+        usuario = AdminUserFactory()
+    yield usuario
+    with django_db_blocker.unblock():
+        usuario.delete()
 
 
 @pytest.fixture
-def user():
+def user(db, _shared_user):
     """Fixture para usuário comum"""
-    return UserFactory()
+    _shared_user.refresh_from_db()
+    return _shared_user
 
 
 @pytest.fixture
-def admin_user():
+def admin_user(db, _shared_admin_user):
     """Fixture para usuário administrador"""
-    return AdminUserFactory()
+    _shared_admin_user.refresh_from_db()
+    return _shared_admin_user
+
+
+# Sessões (cookie assinado) dos usuários compartilhados, geradas por um único
+# force_login por sessão de testes; cada teste recebe um Client novo com uma
+# cópia dos cookies, então logout ou novos cookies não vazam entre testes.
+def _cookies_autenticados(usuario, django_db_blocker):
+    with django_db_blocker.unblock():
+        client = Client()
+        client.force_login(usuario)
+    return client.cookies
+
+
+@pytest.fixture(scope='session')
+def _cookies_user(_shared_user, django_db_blocker):
+    """Cookies de sessão do usuário comum compartilhado"""
+    return _cookies_autenticados(_shared_user, django_db_blocker)
+
+
+@pytest.fixture(scope='session')
+def _cookies_admin_user(_shared_admin_user, django_db_blocker):
+    """Cookies de sessão do administrador compartilhado"""
+    return _cookies_autenticados(_shared_admin_user, django_db_blocker)
 
 
 @pytest.fixture
@@ -54,20 +112,18 @@ def client():
 
 
 @pytest.fixture
-def authenticated_client(user):
+def authenticated_client(user, _cookies_user):
     """Fixture para cliente autenticado"""
-    from django.test import Client
-    
     client = Client()
-    client.force_login(user)
+    client.cookies = copy.deepcopy(_cookies_user)
     return client
 
 
 @pytest.fixture
-def admin_client(admin_user):
+def admin_client(admin_user, _cookies_admin_user):
     """Fixture para cliente admin autenticado"""
     client = Client()
-    client.force_login(admin_user)
+    client.cookies = copy.deepcopy(_cookies_admin_user)
     return client
 
 
@@ -93,6 +149,54 @@ def admin_api_client(admin_user):
     return client
 
 
+@pytest.fixture(scope='class')
+def transacao_da_classe(django_db_setup, django_db_blocker):
+    """
+    Transação externa aberta uma vez por classe e sempre desfeita no teardown.
+    Massas de dados criadas nela servem a todos os testes da classe, cada um
+    no seu savepoint, sem vazar para os demais.
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        try:
+            yield
+        finally:
+            transaction.set_rollback(True)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _congelar_data():
+    """Congela a data uma vez por sessão; tick=True mantém o relógio andando"""
+    if freeze_time is None:
+        yield
+        return
+    with freeze_time(DATA_CONGELADA, tick=True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _limpar_caches_factories():
+    """Descarta objetos memoizados pelas factories, desfeitos no rollback do teste"""
+    yield
+    _get_tipo_doc.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _limpar_cache_django():
+    """Esvazia o cache em memória: valores derivados de dados desfeitos no rollback"""
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _detectar_n_mais_um(request):
+    """Falha o teste marcado com @pytest.mark.nplusone se houver consultas N+1"""
+    if zeal_context is None or request.node.get_closest_marker('nplusone') is None:
+        yield
+        return
+    with zeal_context():
+        yield
+
+
 # Fixtures para modelos
 @pytest.fixture
 def cliente():
@@ -145,8 +249,8 @@ def processo_completo():
 # Fixtures para listas de objetos
 @pytest.fixture
 def clientes_list():
-    """Fixture para lista de clientes"""
-    return ClienteFactory.create_batch(5)
+    """Fixture para lista de clientes (um único INSERT, sem save() por instância)"""
+    return ClienteFactory.create_batch_bulk(5)
 
 
 @pytest.fixture
@@ -170,10 +274,39 @@ def usuario_com_processos(user):
     return user
 
 
+class _UrlsReversas(dict):
+    """Dicionário que resolve e memoriza reverse(nome) no primeiro acesso"""
+
+    def __missing__(self, nome):
+        url = self[nome] = reverse(nome)
+        return url
+
+
+@pytest.fixture(scope='session')
+def urls():
+    """URLs sem argumentos resolvidas uma única vez por sessão: urls['core:dashboard']"""
+    return _UrlsReversas()
+
+
+@pytest.fixture(scope='session')
+def lookups_processo():
+    """Área/tipo e estado/comarca válidos do formulário de processo, lidos uma vez por sessão"""
+    from processos.models import Processo
+    
+    area, dados_area = next(iter(Processo.TIPOS_PROCESSO_POR_AREA.items()))
+    estado, dados_estado = next(iter(Processo.COMARCAS_TRIBUNAIS_POR_ESTADO.items()))
+    return {
+        'area_direito_temp': area,
+        'tipo_processo': dados_area['tipos'][0][0],
+        'estado_temp': estado,
+        'comarca_tribunal': dados_estado['comarcas'][0][0],
+    }
+
+
 # Fixtures para dados de teste
-@pytest.fixture
+@pytest.fixture(scope='module')
 def sample_data():
-    """Fixture com dados de exemplo para testes"""
+    """Fixture com dados de exemplo para testes (compartilhada: use .copy() antes de alterar)"""
     return {
         'cliente_data': {
             'nome_razao_social': 'Cliente Teste',
@@ -268,30 +401,6 @@ def sample_pdf():
         os.unlink(temp_file)
 
 
-# Configurações do pytest
-def pytest_configure(config):
-    """Configuração global do pytest"""
-    import django
-    from django.conf import settings
-    
-    # Configurar Django para testes
-    if not settings.configured:
-        settings.configure(
-            DEBUG=True,
-            TESTING=True,
-            USE_TZ=True,
-            SECRET_KEY='test-secret-key',
-            DATABASES={
-                'default': {
-                    'ENGINE': 'django.db.backends.sqlite3',
-                    'NAME': ':memory:',
-                }
-            }
-        )
-    
-    django.setup()
-
-
 # Marcadores personalizados
 def pytest_configure(config):
     """Registra marcadores personalizados"""
@@ -306,4 +415,7 @@ def pytest_configure(config):
     )
     config.addinivalue_line(
         "markers", "unit: marca testes unitários"
+    )
+    config.addinivalue_line(
+        "markers", "nplusone: falha o teste em consultas N+1 (requer django-zeal)"
     )
\ No newline at end of file
@@ -1,44 +1,181 @@
 """
 Factories para geração de dados de teste usando Factory Boy
 """
+import collections
+import contextlib
+import functools
+import os
+import secrets
+import threading
+import zlib
+
 import factory
+import faker
 from factory.django import DjangoModelFactory
-from factory import Faker, SubFactory, LazyAttribute, Sequence
+from factory import SubFactory, LazyAttribute, Sequence
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import transaction
 from datetime import date, timedelta
 import random
 
+try:
+    from zeal import zeal_ignore
+except ImportError:  # django-zeal é opcional (requirements-dev.txt)
+    zeal_ignore = contextlib.nullcontext
+
 from clientes.models import Cliente, InteracaoCliente
 from processos.models import Processo, Andamento, Prazo
 from documentos.models import Documento, TipoDocumento
 from usuarios.models import Usuario
 from configuracoes.models import TipoProcesso, AreaDireito, StatusProcesso
 
+
+def Faker(provider, **kwargs):
+    """factory.Faker com o locale brasileiro, sem alterar o padrão global do factory_boy"""
+    return factory.Faker(provider, locale='pt_BR', **kwargs)
+
+
 User = get_user_model()
 
+# Pool de atributos gerados pelo Faker: cada registro é gerado uma única vez e
+# depois reaproveitado em rodízio, trocando as chamadas aos providers por
+# instância por um popleft/append. Um pool por thread; cada registro é uma
+# namedtuple, mais compacta que um dict.
+FACTORY_FAKER_POOL = int(os.environ.get('FACTORY_FAKER_POOL', '1000'))
+_faker_local = threading.local()
+
+
+_Perfil = collections.namedtuple(
+    '_Perfil', 'first_name last_name name company email address city postcode'
+)
+
+
+def _proximo_perfil():
+    """Retorna o próximo perfil de atributos falsos do pool da thread"""
+    pool = getattr(_faker_local, 'perfis', None)
+    if pool is None:
+        pool = _faker_local.perfis = collections.deque()
+        _faker_local.fake = faker.Faker('pt_BR')
+        # Semente distinta por worker do pytest-xdist para não repetir os mesmos dados
+        worker = os.environ.get('PYTEST_XDIST_WORKER')
+        if worker:
+            _faker_local.fake.seed_instance(zlib.crc32(worker.encode()))
+    if len(pool) < FACTORY_FAKER_POOL:
+        fake = _faker_local.fake
+        perfil = _Perfil(
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            name=fake.name(),
+            company=fake.company(),
+            email=fake.email(),
+            address=fake.address(),
+            city=fake.city(),
+            postcode=fake.postcode(),
+        )
+    else:
+        perfil = pool.popleft()
+    pool.append(perfil)
+    return perfil
+
+
+@functools.lru_cache(maxsize=None)
+def _textos(max_nb_chars, quantidade=64):
+    """Pool de textos gerados uma única vez por tamanho, percorrido com factory.Iterator"""
+    fake = faker.Faker('pt_BR')
+    return tuple(fake.text(max_nb_chars=max_nb_chars) for _ in range(quantidade))
+
+
+# Tamanho dos lotes usados por create_batch_bulk (um INSERT multi-linha por lote)
+FACTORY_BULK_BATCH = int(os.environ.get('FACTORY_BULK_BATCH', '500'))
+
+
+def _salvar_relacionados(instance):
+    """Salva os objetos relacionados (FK) ainda não persistidos de uma instância construída"""
+    for field in instance._meta.concrete_fields:
+        if not field.many_to_one and not field.one_to_one:
+            continue
+        if not field.is_cached(instance):
+            continue
+        relacionado = field.get_cached_value(instance)
+        if relacionado is not None and relacionado._state.adding:
+            _salvar_relacionados(relacionado)
+            relacionado._skip_validation = True
+            relacionado.save()
+            setattr(instance, field.name, relacionado)
+
+
+class BulkCreateMixin:
+    """
+    Mixin com criação opcional de lotes via bulk_create.
+
+    create_batch continua com um save() por instância. create_batch_bulk e
+    create_bulk não chamam save() nem _create() e não disparam post_save, então
+    a invalidação de cache de core/signals.py e relatorios/signals.py não
+    acontece: use-os apenas para montar dados antes da primeira requisição.
+    """
+
+    @classmethod
+    def create_batch_bulk(cls, size, **kwargs):
+        """Constrói `size` instâncias e as insere com bulk_create, sem save() nem signals"""
+        return cls._bulk_create(cls.build_batch(size, **kwargs))
+
+    @classmethod
+    def create_bulk(cls, linhas, **kwargs):
+        """Constrói uma instância por dicionário de `linhas` (mais `kwargs` comuns) e as insere com bulk_create"""
+        return cls._bulk_create([cls.build(**{**kwargs, **linha}) for linha in linhas])
+
+    @classmethod
+    def _bulk_create(cls, instances):
+        for instance in instances:
+            instance._skip_validation = True
+            _salvar_relacionados(instance)
+        return cls._meta.model.objects.bulk_create(instances, batch_size=FACTORY_BULK_BATCH)
+
+
+@functools.lru_cache(maxsize=None)
+def _senha_codificada(password):
+    """Hash de cada senha de teste calculado uma única vez por processo"""
+    return make_password(password)
+
+
+# Sem lru_cache: o usuário é desfeito junto com a transação de cada teste, então a
+# busca é refeita a cada chamada (um SELECT em vez de INSERT + set_password).
+def _get_system_user():
+    """Usuário "system" compartilhado pelos registros criados no mesmo teste"""
+    return User.objects.filter(username='system').first() or UserFactory(username='system')
+
 
 class UserFactory(DjangoModelFactory):
     """Factory para criação de usuários"""
     
     class Meta:
         model = User
+        skip_postgeneration_save = True
     
     username = Sequence(lambda n: f"user{n}")
-    email = Faker('email')
-    first_name = Faker('first_name')
-    last_name = Faker('last_name')
+    email = LazyAttribute(lambda obj: obj.perfil.email)
+    first_name = LazyAttribute(lambda obj: obj.perfil.first_name)
+    last_name = LazyAttribute(lambda obj: obj.perfil.last_name)
     is_active = True
     is_staff = False
     
-    @factory.post_generation
-    def password(self, create, extracted, **kwargs):
-        """Define senha padrão para usuários de teste"""
-        if not create:
-            return
-        
-        password = extracted or 'testpass123'
-        self.set_password(password)
-        self.save()
+    class Params:
+        perfil = factory.LazyFunction(_proximo_perfil)
+    
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        """Define a senha antes do INSERT; sem password= a senha fica inutilizável (sem hash)"""
+        password = kwargs.pop('password', None)
+        user = model_class(*args, **kwargs)
+        if password:
+            user.password = _senha_codificada(password)
+        else:
+            # force_login/force_authenticate não verificam senha
+            user.set_unusable_password()
+        user.save()
+        return user
 
 
 class AdminUserFactory(UserFactory):
@@ -49,22 +186,22 @@ class AdminUserFactory(UserFactory):
     username = Sequence(lambda n: f"admin{n}")
 
 
-class ClienteFactory(DjangoModelFactory):
+class ClienteFactory(BulkCreateMixin, DjangoModelFactory):
     """Factory para criação de clientes"""
     
     class Meta:
         model = Cliente
         skip_postgeneration_save = True
     
-    nome_razao_social = Faker('company')
+    nome_razao_social = LazyAttribute(lambda obj: obj.perfil.company)
     tipo_pessoa = 'PF'  # Fixo como pessoa física para simplificar
     cpf_cnpj = Sequence(lambda n: f"11144477{n:03d}")
-    email = Faker('email')
+    email = LazyAttribute(lambda obj: obj.perfil.email)
     telefone = factory.LazyAttribute(lambda obj: '(11) 99999-9999')
-    endereco = Faker('address')
-    cidade = Faker('city')
+    endereco = LazyAttribute(lambda obj: obj.perfil.address)
+    cidade = LazyAttribute(lambda obj: obj.perfil.city)
     estado = factory.Iterator(['SP', 'RJ', 'MG', 'RS', 'PR', 'SC', 'BA', 'GO'])
-    cep = Faker('postcode')
+    cep = LazyAttribute(lambda obj: obj.perfil.postcode)
     ativo = True
     
     @classmethod
@@ -77,14 +214,15 @@ class ClienteFactory(DjangoModelFactory):
     
     class Params:
         """Parâmetros para diferentes tipos de clientes"""
+        perfil = factory.LazyFunction(_proximo_perfil)
         pessoa_fisica = factory.Trait(
             tipo_pessoa='PF',
-            nome_razao_social=Faker('name'),
+            nome_razao_social=LazyAttribute(lambda obj: obj.perfil.name),
             cpf_cnpj="11144477735"  # CPF válido conhecido
         )
         pessoa_juridica = factory.Trait(
             tipo_pessoa='PJ',
-            nome_razao_social=Faker('company'),
+            nome_razao_social=LazyAttribute(lambda obj: obj.perfil.company),
             cpf_cnpj="11222333000189"  # CNPJ válido conhecido
         )
         inativo = factory.Trait(
@@ -92,16 +230,16 @@ class ClienteFactory(DjangoModelFactory):
         )
 
 
-class InteracaoClienteFactory(DjangoModelFactory):
+class InteracaoClienteFactory(BulkCreateMixin, DjangoModelFactory):
     """Factory para interações com clientes"""
     
     class Meta:
         model = InteracaoCliente
     
     cliente = SubFactory(ClienteFactory)
-    usuario = SubFactory(UserFactory)
+    usuario = factory.LazyFunction(_get_system_user)
     tipo_interacao = factory.Iterator(['email', 'telefone', 'reuniao', 'whatsapp'])
-    descricao = Faker('text', max_nb_chars=500)
+    descricao = factory.Iterator(_textos(500))
     data_interacao = Faker('date_between', start_date='-30d', end_date='today')
 
 
@@ -113,7 +251,7 @@ class TipoProcessoFactory(DjangoModelFactory):
     
     nome = Faker('word')
     codigo = Faker('lexify', text='???', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-    descricao = Faker('text', max_nb_chars=200)
+    descricao = factory.Iterator(_textos(200))
     cor = Faker('hex_color')
     icone = 'bi-folder'
     ativo = True
@@ -128,7 +266,7 @@ class AreaDireitoFactory(DjangoModelFactory):
     
     nome = Faker('word')
     codigo = Faker('lexify', text='???', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-    descricao = Faker('text', max_nb_chars=200)
+    descricao = factory.Iterator(_textos(200))
     cor = Faker('hex_color')
     icone = 'bi-scales'
     ativo = True
@@ -143,7 +281,7 @@ class StatusProcessoFactory(DjangoModelFactory):
     
     nome = Faker('word')
     codigo = Faker('lexify', text='???', letters='ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-    descricao = Faker('text', max_nb_chars=200)
+    descricao = factory.Iterator(_textos(200))
     cor = Faker('hex_color')
     icone = 'bi-circle'
     is_inicial = False
@@ -153,7 +291,7 @@ class StatusProcessoFactory(DjangoModelFactory):
     ordem = Faker('random_int', min=0, max=100)
 
 
-class ProcessoFactory(DjangoModelFactory):
+class ProcessoFactory(BulkCreateMixin, DjangoModelFactory):
     """Factory para criação de processos"""
     
     class Meta:
@@ -169,7 +307,7 @@ class ProcessoFactory(DjangoModelFactory):
     data_inicio = Faker('date_between', start_date='-2y', end_date='today')
     cliente = SubFactory(ClienteFactory)
     usuario_responsavel = SubFactory(UserFactory)
-    observacoes = Faker('text', max_nb_chars=1000)
+    observacoes = factory.Iterator(_textos(1000))
     
     class Params:
         """Parâmetros para diferentes tipos de processos"""
@@ -186,7 +324,7 @@ class ProcessoFactory(DjangoModelFactory):
         )
 
 
-class AndamentoFactory(DjangoModelFactory):
+class AndamentoFactory(BulkCreateMixin, DjangoModelFactory):
     """Factory para andamentos de processos"""
     
     class Meta:
@@ -198,11 +336,11 @@ class AndamentoFactory(DjangoModelFactory):
         'Petição Inicial', 'Citação', 'Contestação', 'Audiência', 
         'Sentença', 'Recurso', 'Despacho'
     ])
-    descricao = Faker('text', max_nb_chars=1000)
-    usuario = SubFactory(UserFactory)
+    descricao = factory.Iterator(_textos(1000))
+    usuario = factory.LazyFunction(_get_system_user)
 
 
-class PrazoFactory(DjangoModelFactory):
+class PrazoFactory(BulkCreateMixin, DjangoModelFactory):
     """Factory para prazos"""
     
     class Meta:
@@ -211,18 +349,18 @@ class PrazoFactory(DjangoModelFactory):
     processo = SubFactory(ProcessoFactory)
     tipo_prazo = Faker('random_element', elements=['contestacao', 'recurso', 'manifestacao'])
     data_limite = Faker('future_date', end_date='+30d')
-    descricao = Faker('text', max_nb_chars=200)
-    usuario_responsavel = SubFactory(UserFactory)
+    descricao = factory.Iterator(_textos(200))
+    usuario_responsavel = factory.LazyFunction(_get_system_user)
 
     @classmethod
-    def _create(cls, model_class, *args, **kwargs):
+    def _adjust_kwargs(cls, **kwargs):
         dv = kwargs.pop('data_vencimento', None)
         if dv and 'data_limite' not in kwargs:
             kwargs['data_limite'] = dv
         resp = kwargs.pop('responsavel', None)
         if resp and 'usuario_responsavel' not in kwargs:
             kwargs['usuario_responsavel'] = resp
-        return super()._create(model_class, *args, **kwargs)
+        return kwargs
 
 
 class TipoDocumentoFactory(DjangoModelFactory):
@@ -232,27 +370,40 @@ class TipoDocumentoFactory(DjangoModelFactory):
         model = 'documentos.TipoDocumento'
     
     nome = Faker('word')
-    descricao = Faker('text', max_nb_chars=100)
+    descricao = factory.Iterator(_textos(100))
+
+
+# Memoizado por nome; o conftest limpa o cache ao fim de cada teste, quando o
+# rollback desfaz os tipos criados.
+@functools.lru_cache(maxsize=128)
+def _get_tipo_doc(nome):
+    """TipoDocumento pelo nome, criado na primeira vez em que é pedido"""
+    # Um lookup por nome distinto não é N+1: fica fora da detecção do nplusone
+    with zeal_ignore():
+        return TipoDocumento.objects.get_or_create(nome=nome)[0]
 
 
-class DocumentoFactory(DjangoModelFactory):
+class DocumentoFactory(BulkCreateMixin, DjangoModelFactory):
     """Factory para documentos"""
     
     class Meta:
         model = Documento
     
     nome_arquivo = Faker('file_name', extension='pdf')
-    descricao = Faker('text', max_nb_chars=200)
+    descricao = factory.Iterator(_textos(200))
     processo = SubFactory(ProcessoFactory)
     tipo_documento = SubFactory(TipoDocumentoFactory)
     usuario_upload = SubFactory(UserFactory)
-    arquivo = factory.django.FileField(filename='test_document.pdf')
+    arquivo = factory.LazyFunction(lambda: ContentFile(b'', name='test_document.pdf'))
     tamanho_arquivo = 1024
-    hash_arquivo = Faker('sha256')
+    hash_arquivo = factory.LazyFunction(lambda: secrets.token_hex(32))
     extensao = 'pdf'
     
     class Params:
         """Parâmetros para diferentes tipos de documentos"""
+        real_file = factory.Trait(
+            arquivo=factory.django.FileField(filename='test_document.pdf')
+        )
         imagem = factory.Trait(
             nome_arquivo=Faker('file_name', extension='jpg'),
             arquivo=factory.django.ImageField(filename='test_image.jpg'),
@@ -267,20 +418,17 @@ class DocumentoFactory(DjangoModelFactory):
                 self.save(update_fields=['nome_arquivo'])
 
     @classmethod
-    def _create(cls, model_class, *args, **kwargs):
+    def _adjust_kwargs(cls, **kwargs):
         nome = kwargs.pop('nome', None)
         if nome and 'nome_arquivo' not in kwargs:
             kwargs['nome_arquivo'] = nome
         tipo = kwargs.get('tipo_documento')
         if isinstance(tipo, str):
-            from documentos.models import TipoDocumento
-            tipo_obj, _ = TipoDocumento.objects.get_or_create(nome=tipo)
-            kwargs['tipo_documento'] = tipo_obj
+            kwargs['tipo_documento'] = _get_tipo_doc(tipo)
         arquivo = kwargs.get('arquivo')
         if isinstance(arquivo, str):
-            from django.core.files.base import ContentFile
             kwargs['arquivo'] = ContentFile(b'', name=arquivo)
-        return super()._create(model_class, *args, **kwargs)
+        return kwargs
 
 
 # Factories para cenários específicos de teste
@@ -293,14 +441,15 @@ class ProcessoCompletoFactory(ProcessoFactory):
         if not create:
             return
         
-        # Criar andamentos
-        AndamentoFactory.create_batch(3, processo=self)
-        
-        # Criar prazos
-        PrazoFactory.create_batch(2, processo=self)
-        
-        # Criar documentos
-        DocumentoFactory.create_batch(2, processo=self)
+        with transaction.atomic():
+            # Criar andamentos
+            AndamentoFactory.create_batch_bulk(3, processo=self)
+            
+            # Criar prazos
+            PrazoFactory.create_batch_bulk(2, processo=self)
+            
+            # Criar documentos
+            DocumentoFactory.create_batch_bulk(2, processo=self)
 
 
 class ClienteCompletoFactory(ClienteFactory):
@@ -312,18 +461,34 @@ class ClienteCompletoFactory(ClienteFactory):
         if not create:
             return
         
-        # Criar processos
-        ProcessoFactory.create_batch(2, cliente=self)
-        
-        # Criar interações
-        InteracaoClienteFactory.create_batch(3, cliente=self)
+        with transaction.atomic():
+            # Criar processos
+            ProcessoFactory.create_batch_bulk(2, cliente=self)
+            
+            # Criar interações
+            InteracaoClienteFactory.create_batch_bulk(3, cliente=self)
+
+
+# Deslocamentos de updated_at (0 a 30 dias) sorteados em lotes de 4096 com uma
+# única chamada a random.choices, em vez de um random.randint por objeto.
+_TS_OFFSETS = iter(())
+
+
+def _next_offset():
+    """Próximo deslocamento em dias do lote pré-sorteado"""
+    global _TS_OFFSETS
+    try:
+        return next(_TS_OFFSETS)
+    except StopIteration:
+        _TS_OFFSETS = iter(random.choices(range(31), k=4096))
+        return next(_TS_OFFSETS)
 
 
 # Mixins para reutilização
 class TimestampMixin:
     """Mixin para campos de timestamp"""
     created_at = Faker('date_time_between', start_date='-1y', end_date='now')
-    updated_at = LazyAttribute(lambda obj: obj.created_at + timedelta(days=random.randint(0, 30)))
+    updated_at = LazyAttribute(lambda obj: obj.created_at + timedelta(days=_next_offset()))
 
 
 class AuditMixin:
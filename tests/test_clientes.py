@@ -3,15 +3,14 @@ Testes unitários para o módulo de clientes
 """
 import pytest
 from django.test import TestCase
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from rest_framework import status
-from rest_framework.test import APITestCase
 
 from clientes.models import Cliente, InteracaoCliente
 from clientes.forms import ClienteForm
-from tests.factories import ClienteFactory, UserFactory, InteracaoClienteFactory
+from tests.factories import ClienteFactory, InteracaoClienteFactory
 
 User = get_user_model()
 
@@ -29,24 +28,24 @@ class TestClienteModel:
     
     def test_cliente_str_representation(self):
         """Testa representação string do cliente"""
-        cliente = ClienteFactory(nome_razao_social="João Silva")
+        cliente = ClienteFactory.build(nome_razao_social="João Silva")
         assert str(cliente) == "João Silva"
     
     def test_cliente_pessoa_fisica(self):
         """Testa criação de cliente pessoa física"""
-        cliente = ClienteFactory(pessoa_fisica=True)
+        cliente = ClienteFactory.build(pessoa_fisica=True)
         assert cliente.tipo_pessoa == 'PF'
         assert len(cliente.cpf_cnpj) == 11  # CPF tem 11 dígitos
     
     def test_cliente_pessoa_juridica(self):
         """Testa criação de cliente pessoa jurídica"""
-        cliente = ClienteFactory(pessoa_juridica=True)
+        cliente = ClienteFactory.build(pessoa_juridica=True)
         assert cliente.tipo_pessoa == 'PJ'
         assert len(cliente.cpf_cnpj) == 14  # CNPJ tem 14 dígitos
     
     def test_cliente_inativo(self):
         """Testa cliente inativo"""
-        cliente = ClienteFactory(inativo=True)
+        cliente = ClienteFactory.build(inativo=True)
         assert cliente.ativo is False
     
     def test_validacao_email(self):
@@ -106,46 +105,45 @@ class TestInteracaoClienteModel:
             assert interacao.tipo_interacao == tipo
 
 
-class TestClienteViews(TestCase):
-    """Testes para views de clientes"""
+@pytest.mark.django_db
+class TestClienteViews:
+    """Testes para views de clientes (usuário compartilhado pela sessão)"""
     
-    def setUp(self):
-        """Configuração inicial dos testes"""
-        self.user = UserFactory()
-        self.cliente = ClienteFactory()
+    LISTA_URL = reverse_lazy('clientes:lista')
+    CRIAR_URL = reverse_lazy('clientes:criar')
     
-    def test_lista_clientes_requer_login(self):
+    def test_lista_clientes_requer_login(self, client, cliente):
         """Testa que listagem requer autenticação"""
-        url = reverse('clientes:lista')
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, 302)  # Redirect para login
+        url = self.LISTA_URL
+        response = client.get(url)
+        assert response.status_code == 302  # Redirect para login
     
-    def test_lista_clientes_autenticado(self):
+    def test_lista_clientes_autenticado(self, client, user, cliente):
         """Testa listagem com usuário autenticado"""
-        self.client.force_login(self.user)
-        url = reverse('clientes:lista')
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, 200)
+        client.force_login(user)
+        url = self.LISTA_URL
+        response = client.get(url)
+        assert response.status_code == 200
     
-    def test_detalhe_cliente(self):
+    def test_detalhe_cliente(self, client, user, cliente):
         """Testa visualização de detalhes do cliente"""
-        self.client.force_login(self.user)
-        url = reverse('clientes:detalhe', kwargs={'pk': self.cliente.pk})
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, self.cliente.nome_razao_social)
+        client.force_login(user)
+        url = reverse('clientes:detalhe', kwargs={'pk': cliente.pk})
+        response = client.get(url)
+        assert response.status_code == 200
+        assert cliente.nome_razao_social in response.content.decode()
     
-    def test_criar_cliente_get(self):
+    def test_criar_cliente_get(self, client, user, cliente):
         """Testa exibição do formulário de criação"""
-        self.client.force_login(self.user)
-        url = reverse('clientes:criar')
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, 200)
+        client.force_login(user)
+        url = self.CRIAR_URL
+        response = client.get(url)
+        assert response.status_code == 200
     
-    def test_criar_cliente_post_valido(self):
+    def test_criar_cliente_post_valido(self, client, user, cliente):
         """Testa criação de cliente com dados válidos"""
-        self.client.force_login(self.user)
-        url = reverse('clientes:criar')
+        client.force_login(user)
+        url = self.CRIAR_URL
         
         data = {
             'nome_razao_social': 'Novo Cliente',
@@ -159,63 +157,61 @@ class TestClienteViews(TestCase):
             'cep': '01234567'
         }
         
-        response = self.client.post(url, data)
-        self.assertEqual(response.status_code, 302)  # Redirect após sucesso
+        response = client.post(url, data)
+        assert response.status_code == 302  # Redirect após sucesso
         
         # Verifica se cliente foi criado
-        self.assertTrue(
-            Cliente.objects.filter(nome_razao_social='Novo Cliente').exists()
-        )
+        assert Cliente.objects.filter(nome_razao_social='Novo Cliente').exists()
     
-    def test_editar_cliente(self):
+    def test_editar_cliente(self, client, user, cliente):
         """Testa edição de cliente"""
-        self.client.force_login(self.user)
-        url = reverse('clientes:editar', kwargs={'pk': self.cliente.pk})
+        client.force_login(user)
+        url = reverse('clientes:editar', kwargs={'pk': cliente.pk})
         
         data = {
             'nome_razao_social': 'Cliente Editado',
-            'tipo_pessoa': self.cliente.tipo_pessoa,
-            'cpf_cnpj': self.cliente.cpf_cnpj,
-            'email': self.cliente.email,
-            'telefone': self.cliente.telefone,
-            'endereco': self.cliente.endereco,
-            'cidade': self.cliente.cidade,
-            'uf': self.cliente.uf,
-            'cep': self.cliente.cep
+            'tipo_pessoa': cliente.tipo_pessoa,
+            'cpf_cnpj': cliente.cpf_cnpj,
+            'email': cliente.email,
+            'telefone': cliente.telefone,
+            'endereco': cliente.endereco,
+            'cidade': cliente.cidade,
+            'uf': cliente.uf,
+            'cep': cliente.cep
         }
         
-        response = self.client.post(url, data)
-        self.assertEqual(response.status_code, 302)
+        response = client.post(url, data)
+        assert response.status_code == 302
         
         # Verifica se foi editado
-        self.cliente.refresh_from_db()
-        self.assertEqual(self.cliente.nome_razao_social, 'Cliente Editado')
+        cliente.refresh_from_db()
+        assert cliente.nome_razao_social == 'Cliente Editado'
     
-    def test_busca_clientes(self):
+    def test_busca_clientes(self, client, user, cliente):
         """Testa busca de clientes"""
-        self.client.force_login(self.user)
+        client.force_login(user)
         
         # Criar cliente com nome específico
         ClienteFactory(nome_razao_social='Cliente Específico')
         
-        url = reverse('clientes:lista')
-        response = self.client.get(url, {'q': 'Específico'})
+        url = self.LISTA_URL
+        response = client.get(url, {'q': 'Específico'})
         
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, 'Cliente Específico')
+        assert response.status_code == 200
+        assert 'Cliente Específico' in response.content.decode()
     
-    def test_filtro_por_tipo_pessoa(self):
+    def test_filtro_por_tipo_pessoa(self, client, user, cliente):
         """Testa filtro por tipo de pessoa"""
-        self.client.force_login(self.user)
+        client.force_login(user)
         
         # Criar clientes de tipos diferentes
         ClienteFactory(tipo_pessoa='PF')
         ClienteFactory(tipo_pessoa='PJ')
         
-        url = reverse('clientes:lista')
-        response = self.client.get(url, {'tipo_pessoa': 'PF'})
+        url = self.LISTA_URL
+        response = client.get(url, {'tipo_pessoa': 'PF'})
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
 
 
 class TestClienteForms(TestCase):
@@ -262,30 +258,26 @@ class TestClienteForms(TestCase):
             self.assertIn(campo, form.errors)
 
 
-class TestClienteAPI(APITestCase):
-    """Testes para API de clientes"""
-    
-    def setUp(self):
-        """Configuração inicial dos testes de API"""
-        self.user = UserFactory()
-        self.cliente = ClienteFactory()
+@pytest.mark.django_db
+class TestClienteAPI:
+    """Testes para API de clientes (usuário compartilhado pela sessão)"""
     
-    def test_lista_clientes_api_sem_auth(self):
+    def test_lista_clientes_api_sem_auth(self, api_client, cliente):
         """Testa API sem autenticação"""
         url = reverse('api:clientes-list')
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
-    def test_lista_clientes_api_com_auth(self):
+    def test_lista_clientes_api_com_auth(self, api_client, user, cliente):
         """Testa API com autenticação"""
-        self.client.force_authenticate(user=self.user)
+        api_client.force_authenticate(user=user)
         url = reverse('api:clientes-list')
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
     
-    def test_criar_cliente_api(self):
+    def test_criar_cliente_api(self, api_client, user, cliente):
         """Testa criação via API"""
-        self.client.force_authenticate(user=self.user)
+        api_client.force_authenticate(user=user)
         url = reverse('api:clientes-list')
         
         data = {
@@ -296,44 +288,43 @@ class TestClienteAPI(APITestCase):
             'telefone': '11888888888'
         }
         
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = api_client.post(url, data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
         
         # Verifica se foi criado
-        self.assertTrue(
-            Cliente.objects.filter(nome_razao_social='Cliente API').exists()
-        )
+        assert Cliente.objects.filter(nome_razao_social='Cliente API').exists()
     
-    def test_detalhe_cliente_api(self):
+    def test_detalhe_cliente_api(self, api_client, user, cliente):
         """Testa detalhes via API"""
-        self.client.force_authenticate(user=self.user)
-        url = reverse('api:clientes-detail', kwargs={'pk': self.cliente.pk})
-        response = self.client.get(url)
+        api_client.force_authenticate(user=user)
+        url = reverse('api:clientes-detail', kwargs={'pk': cliente.pk})
+        response = api_client.get(url)
         
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['id'], self.cliente.pk)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['id'] == cliente.pk
     
-    def test_atualizar_cliente_api(self):
+    def test_atualizar_cliente_api(self, api_client, user, cliente):
         """Testa atualização via API"""
-        self.client.force_authenticate(user=self.user)
-        url = reverse('api:clientes-detail', kwargs={'pk': self.cliente.pk})
+        api_client.force_authenticate(user=user)
+        url = reverse('api:clientes-detail', kwargs={'pk': cliente.pk})
         
         data = {
             'nome_razao_social': 'Cliente Atualizado API',
-            'tipo_pessoa': self.cliente.tipo_pessoa,
-            'cpf_cnpj': self.cliente.cpf_cnpj,
-            'email': self.cliente.email
+            'tipo_pessoa': cliente.tipo_pessoa,
+            'cpf_cnpj': cliente.cpf_cnpj,
+            'email': cliente.email
         }
         
-        response = self.client.patch(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = api_client.patch(url, data, format='json')
+        assert response.status_code == status.HTTP_200_OK
         
         # Verifica se foi atualizado
-        self.cliente.refresh_from_db()
-        self.assertEqual(self.cliente.nome_razao_social, 'Cliente Atualizado API')
+        cliente.refresh_from_db()
+        assert cliente.nome_razao_social == 'Cliente Atualizado API'
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group(name='heavy_clientes')
 class TestClienteIntegration:
     """Testes de integração para clientes"""
     
@@ -393,7 +384,24 @@ class TestClienteIntegration:
         assert response.context['cliente'].interacoes.count() == 3
 
 
+def _seed_clientes(n):
+    """Insere n clientes mínimos com um único bulk_create (sem Faker)"""
+    return Cliente.objects.bulk_create(
+        [
+            Cliente(
+                nome_razao_social=f'C{i}',
+                tipo_pessoa='PF',
+                cpf_cnpj=f'{i:011d}',
+                email=f'c{i}@x.com',
+            )
+            for i in range(n)
+        ],
+        batch_size=1000,
+    )
+
+
 @pytest.mark.slow
+@pytest.mark.xdist_group(name='heavy_clientes')
 class TestClientePerformance:
     """Testes de performance para clientes"""
     
@@ -403,7 +411,7 @@ class TestClientePerformance:
         import time
         
         # Criar muitos clientes
-        ClienteFactory.create_batch(100)
+        _seed_clientes(100)
         
         url = reverse('clientes:lista')
         
@@ -417,17 +425,15 @@ class TestClientePerformance:
     @pytest.mark.django_db
     def test_queries_otimizadas(self, authenticated_client):
         """Testa se as queries estão otimizadas"""
-        from django.test.utils import override_settings
+        from django.test.utils import CaptureQueriesContext
         from django.db import connection
         
-        ClienteFactory.create_batch(10)
+        ClienteFactory.create_batch_bulk(10)
         
-        with override_settings(DEBUG=True):
-            connection.queries_log.clear()
-            
-            url = reverse('clientes:lista')
+        url = reverse('clientes:lista')
+        with CaptureQueriesContext(connection) as ctx:
             response = authenticated_client.get(url)
-            
-            assert response.status_code == 200
-            # Deve usar poucas queries (select_related/prefetch_related)
-            assert len(connection.queries) < 10
\ No newline at end of file
+        
+        assert response.status_code == 200
+        # Deve usar poucas queries (select_related/prefetch_related)
+        assert len(ctx.captured_queries) < 10
\ No newline at end of file
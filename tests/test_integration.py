@@ -1,18 +1,34 @@
 """
 Testes de integração para fluxos completos do sistema
 """
+import contextlib
+import io
+import re
+
+import factory
+import openpyxl
 import pytest
 from datetime import date, timedelta
-from django.test import TestCase, TransactionTestCase
-from django.urls import reverse
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import resolve, reverse
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, OuterRef
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django_redis.serializers.json import JSONSerializer
+
+try:
+    from zeal import zeal_ignore
+except ImportError:  # django-zeal é opcional (requirements-dev.txt)
+    zeal_ignore = contextlib.nullcontext
 
 from clientes.models import Cliente, InteracaoCliente
 from processos.models import Processo, Andamento, Prazo
+from processos.views import ProcessoListView
 from documentos.models import Documento
 from tests.factories import (
     UserFactory, ClienteFactory, ProcessoFactory,
@@ -23,23 +39,35 @@ from tests.factories import (
 
 User = get_user_model()
 
+# Orçamentos de consultas por página (medidos: dashboard 11, detalhe do
+# cliente 11, listagem de processos 3, busca global 3). Independem do volume
+# de dados; estourar o limite indica um select_related/prefetch perdido.
+DASHBOARD_MAX_QUERIES = 12
+DASHBOARD_CACHE_HIT_MAX_QUERIES = 3
+CLIENTE_DETALHE_MAX_QUERIES = 12
+PROCESSOS_LISTA_MAX_QUERIES = 4
+BUSCA_GLOBAL_MAX_QUERIES = 4
 
+
+@pytest.mark.nplusone
 @pytest.mark.integration
 class TestFluxoCompletoAdvogado:
     """Testa fluxo completo de um advogado usando o sistema"""
     
     @pytest.mark.django_db
-    def test_dia_trabalho_advogado(self, authenticated_client):
+    def test_dia_trabalho_advogado(self, authenticated_client, urls, lookups_processo):
         """Simula um dia de trabalho completo de um advogado"""
         client = authenticated_client
         
         # 1. Login e acesso ao dashboard
-        dashboard_url = reverse('core:dashboard')
-        response = client.get(dashboard_url)
+        dashboard_url = urls['core:dashboard']
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(dashboard_url)
         assert response.status_code == 200
+        assert len(ctx.captured_queries) <= DASHBOARD_MAX_QUERIES
         
         # 2. Cadastrar novo cliente
-        create_client_url = reverse('clientes:criar')
+        create_client_url = urls['clientes:criar']
         client_data = {
             'nome_razao_social': 'João Silva',
             'tipo_pessoa': 'PF',
@@ -55,11 +83,11 @@ class TestFluxoCompletoAdvogado:
         response = client.post(create_client_url, client_data)
         assert response.status_code == 302
         
-        # Buscar cliente criado
-        cliente = Cliente.objects.get(nome_razao_social='João Silva')
+        # PK do cliente criado, extraída do redirect para o detalhe (sem SELECT)
+        cliente_pk = resolve(response['Location']).kwargs['pk']
         
         # 3. Registrar interação com cliente
-        interaction_url = reverse('clientes:criar_interacao', kwargs={'cliente_pk': cliente.pk})
+        interaction_url = reverse('clientes:criar_interacao', kwargs={'cliente_pk': cliente_pk})
         interaction_data = {
             'tipo_interacao': 'reuniao',
             'descricao': 'Reunião inicial para discussão do caso',
@@ -71,12 +99,14 @@ class TestFluxoCompletoAdvogado:
         assert response.status_code == 302
         
         # 4. Criar processo para o cliente
-        create_process_url = reverse('processos:criar')
+        create_process_url = urls['processos:criar']
         process_data = {
             'numero_processo': '1000001-11.2023.5.02.0001',
-            'cliente': cliente.pk,
-            'tipo_processo': 1,  # Assumindo que existe
-            'tribunal': 1,       # Assumindo que existe
+            'cliente': cliente_pk,
+            'area_direito_temp': lookups_processo['area_direito_temp'],
+            'tipo_processo': lookups_processo['tipo_processo'],
+            'estado_temp': lookups_processo['estado_temp'],
+            'comarca_tribunal': lookups_processo['comarca_tribunal'],
             'assunto': 'Ação trabalhista - horas extras',
             'valor_causa': '15000.00',
             'status': 'ativo',
@@ -86,11 +116,11 @@ class TestFluxoCompletoAdvogado:
         response = client.post(create_process_url, process_data)
         assert response.status_code == 302
         
-        # Buscar processo criado
-        processo = Processo.objects.get(numero_processo='1000001-11.2023.5.02.0001')
+        # PK do processo criado, extraída do redirect para o detalhe (sem SELECT)
+        processo_pk = resolve(response['Location']).kwargs['pk']
         
         # 5. Adicionar andamento inicial
-        andamento_url = reverse('processos:criar_andamento', kwargs={'pk': processo.pk})
+        andamento_url = reverse('processos:criar_andamento', kwargs={'pk': processo_pk})
         andamento_data = {
             'tipo_andamento': 'peticao',
             'descricao': 'Petição inicial protocolada',
@@ -102,7 +132,7 @@ class TestFluxoCompletoAdvogado:
         assert response.status_code == 302
         
         # 6. Criar prazo para contestação
-        prazo_url = reverse('processos:criar_prazo', kwargs={'pk': processo.pk})
+        prazo_url = reverse('processos:criar_prazo', kwargs={'pk': processo_pk})
         prazo_data = {
             'descricao': 'Prazo para contestação da ré',
             'data_vencimento': (date.today() + timedelta(days=15)).strftime('%Y-%m-%d'),
@@ -114,8 +144,10 @@ class TestFluxoCompletoAdvogado:
         assert response.status_code == 302
         
         # 7. Verificar dashboard atualizado
-        response = client.get(dashboard_url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(dashboard_url)
         assert response.status_code == 200
+        assert len(ctx.captured_queries) <= DASHBOARD_MAX_QUERIES
         
         # Verificar se as informações aparecem no dashboard
         content = response.content.decode()
@@ -123,18 +155,25 @@ class TestFluxoCompletoAdvogado:
         assert '1000001-11.2023.5.02.0001' in content
         
         # 8. Verificar relatórios
-        reports_url = reverse('core:relatorios')
+        reports_url = urls['core:relatorios']
         response = client.get(reports_url)
         assert response.status_code == 200
         
-        # Verificar se cliente e processo aparecem nos relatórios
-        assert Cliente.objects.filter(nome_razao_social='João Silva').exists()
-        assert Processo.objects.filter(numero_processo='1000001-11.2023.5.02.0001').exists()
-        assert Andamento.objects.filter(processo=processo).exists()
-        assert Prazo.objects.filter(processo=processo).exists()
+        # Verificar cliente, processo, andamento e prazo numa única consulta
+        resumo = Processo.objects.filter(pk=processo_pk).annotate(
+            cliente_nome=F('cliente__nome_razao_social'),
+            tem_andamento=Exists(Andamento.objects.filter(processo=OuterRef('pk'))),
+            tem_prazo=Exists(Prazo.objects.filter(processo=OuterRef('pk'))),
+        ).values('numero_processo', 'cliente_nome', 'tem_andamento', 'tem_prazo').get()
+        assert resumo == {
+            'numero_processo': '1000001-11.2023.5.02.0001',
+            'cliente_nome': 'João Silva',
+            'tem_andamento': True,
+            'tem_prazo': True,
+        }
     
     @pytest.mark.django_db
-    def test_gestao_prazos_completa(self, authenticated_client):
+    def test_gestao_prazos_completa(self, authenticated_client, urls):
         """Testa gestão completa de prazos"""
         client = authenticated_client
         
@@ -166,12 +205,12 @@ class TestFluxoCompletoAdvogado:
         )
         
         # 1. Verificar página de prazos
-        prazos_url = reverse('processos:prazos')
+        prazos_url = urls['processos:prazos']
         response = client.get(prazos_url)
         assert response.status_code == 200
         
         # 2. Verificar prazos vencendo
-        prazos_vencendo_url = reverse('processos:prazos_vencendo')
+        prazos_vencendo_url = urls['processos:prazos_vencendo']
         response = client.get(prazos_vencendo_url)
         assert response.status_code == 200
         
@@ -189,21 +228,22 @@ class TestFluxoCompletoAdvogado:
         assert prazo_hoje.cumprido is True
         
         # 4. Verificar dashboard com alertas de prazos
-        dashboard_url = reverse('core:dashboard')
+        dashboard_url = urls['core:dashboard']
         response = client.get(dashboard_url)
         assert response.status_code == 200
         
         # Deve mostrar prazos vencidos e vencendo
         content = response.content.decode()
-        assert 'Prazo vencido' in content or 'prazos vencidos' in content.lower()
+        assert 'Prazo vencido' in content or re.search(rb'prazos vencidos', response.content, re.IGNORECASE)
 
 
+@pytest.mark.nplusone
 @pytest.mark.integration
 class TestFluxoClienteProcesso:
     """Testa integração entre clientes e processos"""
     
     @pytest.mark.django_db
-    def test_cliente_multiplos_processos(self, authenticated_client):
+    def test_cliente_multiplos_processos(self, authenticated_client, urls):
         """Testa cliente com múltiplos processos"""
         client = authenticated_client
         
@@ -240,8 +280,10 @@ class TestFluxoClienteProcesso:
         
         # Verificar página do cliente
         cliente_url = reverse('clientes:detalhe', kwargs={'pk': cliente.pk})
-        response = client.get(cliente_url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(cliente_url)
         assert response.status_code == 200
+        assert len(ctx.captured_queries) <= CLIENTE_DETALHE_MAX_QUERIES
         
         content = response.content.decode()
         
@@ -255,13 +297,18 @@ class TestFluxoClienteProcesso:
         assert 'Ação trabalhista' in content
         assert 'Ação cível' in content
         
-        # Verificar contadores
-        assert cliente.processos.count() == 3
+        # Verificar contadores (COUNT agregado numa única consulta)
+        n_processos = Cliente.objects.filter(pk=cliente.pk).annotate(
+            n=Count('processos')
+        ).values_list('n', flat=True).get()
+        assert n_processos == 3
         
         # Verificar página de processos filtrada por cliente
-        processos_url = reverse('processos:lista')
-        response = client.get(processos_url, {'cliente': cliente.pk})
+        processos_url = urls['processos:lista']
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(processos_url, {'cliente': cliente.pk})
         assert response.status_code == 200
+        assert len(ctx.captured_queries) <= PROCESSOS_LISTA_MAX_QUERIES
         
         # Deve mostrar apenas os processos deste cliente
         content = response.content.decode()
@@ -303,11 +350,7 @@ class TestFluxoClienteProcesso:
             }
         ]
         
-        for interacao_data in interacoes_data:
-            InteracaoClienteFactory(
-                cliente=cliente,
-                **interacao_data
-            )
+        InteracaoClienteFactory.create_bulk(interacoes_data, cliente=cliente)
         
         # Verificar página do cliente
         cliente_url = reverse('clientes:detalhe', kwargs={'pk': cliente.pk})
@@ -330,6 +373,7 @@ class TestFluxoClienteProcesso:
         assert interacoes.last().descricao == 'Primeiro contato por email'
 
 
+@pytest.mark.nplusone
 @pytest.mark.integration
 class TestFluxoDocumentos:
     """Testa fluxo completo de documentos"""
@@ -365,11 +409,7 @@ class TestFluxoDocumentos:
             }
         ]
         
-        for doc_data in documentos_data:
-            DocumentoFactory(
-                processo=processo,
-                **doc_data
-            )
+        DocumentoFactory.create_bulk(documentos_data, processo=processo)
         
         # Verificar página do processo
         processo_url = reverse('processos:detalhe', kwargs={'pk': processo.pk})
@@ -384,8 +424,11 @@ class TestFluxoDocumentos:
         assert 'Contrato de Trabalho' in content
         assert 'Certidão de Tempo de Serviço' in content
         
-        # Verificar contadores
-        assert processo.documentos.count() == 4
+        # Verificar contadores (COUNT agregado numa única consulta)
+        n_documentos = Processo.objects.filter(pk=processo.pk).annotate(
+            n=Count('documentos')
+        ).values_list('n', flat=True).get()
+        assert n_documentos == 4
         
         # Verificar página específica de documentos
         documentos_url = reverse('documentos:processo', kwargs={'processo_id': processo.pk})
@@ -399,19 +442,27 @@ class TestFluxoDocumentos:
         assert 'Petição Inicial' in content
 
 
+@pytest.mark.nplusone
 class TestIntegracaoAPI(APITestCase):
     """Testes de integração da API"""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Usuário e URLs da API compartilhados pela classe"""
+        cls.user = UserFactory()
+        cls.clientes_url = reverse('api:clientes-list')
+        cls.processos_url = reverse('api:processos-list')
+        cls.andamentos_url = reverse('api:andamentos-list')
+        cls.prazos_url = reverse('api:prazos-list')
+    
     def setUp(self):
-        """Configuração inicial"""
-        self.user = UserFactory()
+        """Autentica o cliente de API (por instância de teste)"""
         self.client.force_authenticate(user=self.user)
     
     def test_fluxo_completo_api(self):
         """Testa fluxo completo via API"""
         
         # 1. Criar cliente via API
-        clientes_url = reverse('api:clientes-list')
         cliente_data = {
             'nome_razao_social': 'Cliente API',
             'tipo_pessoa': 'PF',
@@ -420,12 +471,11 @@ class TestIntegracaoAPI(APITestCase):
             'telefone': '11888888888'
         }
         
-        response = self.client.post(clientes_url, cliente_data, format='json')
+        response = self.client.post(self.clientes_url, cliente_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         cliente_id = response.data['id']
         
         # 2. Criar processo via API
-        processos_url = reverse('api:processos-list')
         processo_data = {
             'numero_processo': '9999999-99.2023.8.26.0001',
             'cliente': cliente_id,
@@ -433,12 +483,11 @@ class TestIntegracaoAPI(APITestCase):
             'status': 'ativo'
         }
         
-        response = self.client.post(processos_url, processo_data, format='json')
+        response = self.client.post(self.processos_url, processo_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         processo_id = response.data['id']
         
         # 3. Criar andamento via API
-        andamentos_url = reverse('api:andamentos-list')
         andamento_data = {
             'processo': processo_id,
             'tipo_andamento': 'peticao',
@@ -446,11 +495,10 @@ class TestIntegracaoAPI(APITestCase):
             'data_andamento': date.today().isoformat()
         }
         
-        response = self.client.post(andamentos_url, andamento_data, format='json')
+        response = self.client.post(self.andamentos_url, andamento_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
         # 4. Criar prazo via API
-        prazos_url = reverse('api:prazos-list')
         prazo_data = {
             'processo': processo_id,
             'descricao': 'Prazo via API',
@@ -458,17 +506,17 @@ class TestIntegracaoAPI(APITestCase):
             'tipo_prazo': 'contestacao'
         }
         
-        response = self.client.post(prazos_url, prazo_data, format='json')
+        response = self.client.post(self.prazos_url, prazo_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
         # 5. Verificar dados criados
         # Cliente
-        response = self.client.get(f'{clientes_url}{cliente_id}/')
+        response = self.client.get(f'{self.clientes_url}{cliente_id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['nome_razao_social'], 'Cliente API')
         
         # Processo
-        response = self.client.get(f'{processos_url}{processo_id}/')
+        response = self.client.get(f'{self.processos_url}{processo_id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['assunto'], 'Processo via API')
         
@@ -477,17 +525,17 @@ class TestIntegracaoAPI(APITestCase):
         
         # 6. Testar filtros e buscas
         # Buscar processos por cliente
-        response = self.client.get(processos_url, {'cliente': cliente_id})
+        response = self.client.get(self.processos_url, {'cliente': cliente_id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         
         # Buscar andamentos por processo
-        response = self.client.get(andamentos_url, {'processo': processo_id})
+        response = self.client.get(self.andamentos_url, {'processo': processo_id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         
         # Buscar prazos por processo
-        response = self.client.get(prazos_url, {'processo': processo_id})
+        response = self.client.get(self.prazos_url, {'processo': processo_id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
     
@@ -495,14 +543,13 @@ class TestIntegracaoAPI(APITestCase):
         """Testa validações da API"""
         
         # Tentar criar cliente com dados inválidos
-        clientes_url = reverse('api:clientes-list')
         cliente_data = {
             'nome_razao_social': '',  # Campo obrigatório vazio
             'tipo_pessoa': 'INVALID',  # Tipo inválido
             'email': 'email_invalido'  # Email inválido
         }
         
-        response = self.client.post(clientes_url, cliente_data, format='json')
+        response = self.client.post(self.clientes_url, cliente_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         
         # Verificar se os erros estão presentes
@@ -514,75 +561,93 @@ class TestIntegracaoAPI(APITestCase):
         cliente = ClienteFactory()
         ProcessoFactory(numero_processo='1111111-11.2023.8.26.0001')
         
-        processos_url = reverse('api:processos-list')
         processo_data = {
             'numero_processo': '1111111-11.2023.8.26.0001',  # Número duplicado
             'cliente': cliente.pk,
             'assunto': 'Processo duplicado'
         }
         
-        response = self.client.post(processos_url, processo_data, format='json')
+        response = self.client.post(self.processos_url, processo_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('numero_processo', response.data)
 
 
+@pytest.fixture(scope='class')
+def big_dataset(transacao_da_classe):
+    """Massa de dados das medições de performance, criada uma vez por classe
+
+    Fica numa transação externa desfeita no teardown; cada teste roda dentro
+    de um savepoint próprio, então os dados não vazam para outros testes.
+    A classe usa o grupo 'serial' do xdist para que a massa seja montada num
+    único worker, e não uma vez em cada worker que recebesse um dos testes.
+    """
+    clientes = ClienteFactory.create_batch_bulk(
+        30, nome_razao_social='Cliente Teste'
+    )
+    # 2 processos para cada um dos 20 primeiros clientes
+    processos = ProcessoFactory.create_batch_bulk(
+        40, cliente=factory.Iterator(clientes[:20]), assunto='Processo Teste'
+    )
+    # Andamentos e prazos apenas nos primeiros 10 processos
+    primeiros = processos[:10]
+    AndamentoFactory.create_batch_bulk(30, processo=factory.Iterator(primeiros))
+    PrazoFactory.create_batch_bulk(20, processo=factory.Iterator(primeiros))
+    yield {'clientes': clientes, 'processos': processos}
+
+
+@pytest.mark.nplusone
 @pytest.mark.integration
 @pytest.mark.slow
+@pytest.mark.benchmark
+@pytest.mark.xdist_group(name='serial')
 class TestPerformanceIntegration:
-    """Testes de performance e integração"""
+    """Testes de performance e integração
+
+    Sob o xdist (addopts) o pytest-benchmark fica desativado e cada requisição
+    roda uma vez só; os tempos são medidos com `pytest -n0 -m benchmark --benchmark-only`.
+    """
     
     @pytest.mark.django_db
-    def test_dashboard_com_muitos_dados(self, authenticated_client):
+    def test_dashboard_com_muitos_dados(self, authenticated_client, benchmark, big_dataset, urls):
         """Testa performance do dashboard com muitos dados"""
-        import time
-        
-        # Criar muitos dados
-        clientes = ClienteFactory.create_batch(20)
-        processos = []
-        
-        for cliente in clientes:
-            # 2-3 processos por cliente
-            cliente_processos = ProcessoFactory.create_batch(2, cliente=cliente)
-            processos.extend(cliente_processos)
+        dashboard_url = urls['core:dashboard']
         
-        # Adicionar andamentos e prazos
-        for processo in processos[:10]:  # Apenas nos primeiros 10 para não ser muito lento
-            AndamentoFactory.create_batch(3, processo=processo)
-            PrazoFactory.create_batch(2, processo=processo)
-        
-        # Testar performance do dashboard
-        dashboard_url = reverse('core:dashboard')
-        
-        start_time = time.time()
-        response = authenticated_client.get(dashboard_url)
-        end_time = time.time()
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.get(dashboard_url)
         
         assert response.status_code == 200
-        assert (end_time - start_time) < 5.0  # Deve carregar em menos de 5 segundos
+        # Número de consultas constante, independente do volume de dados
+        assert len(ctx.captured_queries) <= DASHBOARD_MAX_QUERIES
+        
+        # Tempo medido pelo pytest-benchmark; repetir a mesma requisição não é
+        # N+1, por isso fora da detecção do zeal
+        with zeal_ignore():
+            response = benchmark.pedantic(
+                authenticated_client.get, args=(dashboard_url,), rounds=5, iterations=1
+            )
+        assert response.status_code == 200
         
         # Verificar se os dados aparecem
-        content = response.content.decode()
-        assert 'clientes' in content.lower()
-        assert 'processos' in content.lower()
+        # Busca sem diferenciar maiúsculas direto nos bytes (sem copiar o corpo)
+        assert re.search(rb'clientes', response.content, re.IGNORECASE)
+        assert re.search(rb'processos', response.content, re.IGNORECASE)
     
     @pytest.mark.django_db
-    def test_busca_global_performance(self, authenticated_client):
+    def test_busca_global_performance(self, authenticated_client, benchmark, big_dataset, urls):
         """Testa performance da busca global"""
-        import time
-        
-        # Criar dados para busca
-        ClienteFactory.create_batch(30, nome_razao_social='Cliente Teste')
-        ProcessoFactory.create_batch(20, assunto='Processo Teste')
+        search_url = urls['core:busca_global']
         
-        # Testar busca
-        search_url = reverse('core:busca_global')
-        
-        start_time = time.time()
-        response = authenticated_client.get(search_url, {'q': 'Teste'})
-        end_time = time.time()
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.get(search_url, {'q': 'Teste'})
         
         assert response.status_code == 200
-        assert (end_time - start_time) < 3.0  # Busca deve ser rápida
+        assert len(ctx.captured_queries) <= BUSCA_GLOBAL_MAX_QUERIES
+        
+        with zeal_ignore():
+            response = benchmark.pedantic(
+                authenticated_client.get, args=(search_url, {'q': 'Teste'}),
+                rounds=5, iterations=1
+            )
         
         # Verificar resultados
         content = response.content.decode()
@@ -590,7 +655,8 @@ class TestPerformanceIntegration:
         assert 'Processo Teste' in content
 
 
-class TestTransacionalIntegration(TransactionTestCase):
+@pytest.mark.integration
+class TestTransacionalIntegration(TestCase):
     """Testes que requerem controle de transações"""
     
     def test_rollback_em_erro(self):
@@ -631,9 +697,13 @@ class TestTransacionalIntegration(TransactionTestCase):
             # Criar prazos
             prazos = PrazoFactory.create_batch(2, processo=processo)
             
-            # Verificar integridade
-            assert processo.andamentos.count() == 3
-            assert processo.prazos.count() == 2
+            # Verificar integridade (os dois contadores numa única consulta;
+            # distinct porque os dois JOINs multiplicam as linhas)
+            contadores = Processo.objects.filter(pk=processo.pk).annotate(
+                a=Count('andamentos', distinct=True),
+                p=Count('prazos', distinct=True),
+            ).values('a', 'p').get()
+            assert contadores == {'a': 3, 'p': 2}
             
             # Verificar relacionamentos
             for andamento in andamentos:
@@ -672,9 +742,9 @@ class TestFluxoFinanceiroCompleto:
         # 2. Gerar parcelas
         honorario.gerar_parcelas()
         
-        # 3. Verificar se as parcelas foram criadas
-        parcelas = ParcelaHonorario.objects.filter(honorario=honorario)
-        assert parcelas.count() == 2
+        # 3. Verificar se as parcelas foram criadas (uma única consulta)
+        parcelas = list(ParcelaHonorario.objects.filter(honorario=honorario))
+        assert len(parcelas) == 2
         
         # 4. Verificar valor das parcelas
         for parcela in parcelas:
@@ -682,20 +752,27 @@ class TestFluxoFinanceiroCompleto:
             assert parcela.status == 'pendente'
         
         # 5. Simular pagamento da primeira parcela
-        primeira_parcela = parcelas.first()
+        primeira_parcela = parcelas[0]
         primeira_parcela.marcar_como_paga(
             valor_pago=Decimal('1000.00'),
             data_pagamento=date.today()
         )
         
-        # 6. Verificar status após pagamento
-        primeira_parcela.refresh_from_db()
-        assert primeira_parcela.status == 'pago'
-        assert primeira_parcela.valor_pago == Decimal('1000.00')
+        # 6. Verificar status após pagamento (apenas as colunas conferidas)
+        rows = {
+            r['id']: r
+            for r in ParcelaHonorario.objects.filter(honorario=honorario).values(
+                'id', 'status', 'valor_pago'
+            )
+        }
+        assert rows[primeira_parcela.pk]['status'] == 'pago'
+        assert rows[primeira_parcela.pk]['valor_pago'] == Decimal('1000.00')
         
         # 7. Verificar status do honorário
-        honorario.refresh_from_db()
-        assert honorario.status_pagamento == 'parcial'
+        status_pagamento = Honorario.objects.filter(pk=honorario.pk).values_list(
+            'status_pagamento', flat=True
+        )[0]
+        assert status_pagamento == 'parcial'
     
     @pytest.mark.django_db
     def test_relatorio_financeiro_integrado(self, authenticated_client):
@@ -706,11 +783,11 @@ class TestFluxoFinanceiroCompleto:
         client = authenticated_client
         
         # Criar clientes e processos de teste
-        clientes = ClienteFactory.create_batch(3)
+        clientes = ClienteFactory.create_batch_bulk(3)
+        processos = ProcessoFactory.create_batch_bulk(3, cliente=factory.Iterator(clientes))
         
-        for cliente in clientes:
-            processo = ProcessoFactory(cliente=cliente)
-            Honorario.objects.create(
+        Honorario.objects.bulk_create([
+            Honorario(
                 cliente=cliente,
                 processo=processo,
                 tipo_cobranca='fixo',
@@ -719,6 +796,8 @@ class TestFluxoFinanceiroCompleto:
                 data_vencimento=date.today() + timedelta(days=30),
                 observacoes=f'Honorários {cliente.nome_razao_social}'
             )
+            for cliente, processo in zip(clientes, processos)
+        ])
         
         # Verificar se os dados foram criados corretamente
         total_honorarios = Honorario.objects.count()
@@ -737,7 +816,7 @@ class TestFluxoNotificacoes:
     """Testa sistema de notificações integrado"""
     
     @pytest.mark.django_db
-    def test_notificacao_prazo_vencimento(self, authenticated_client):
+    def test_notificacao_prazo_vencimento(self, authenticated_client, django_assert_num_queries):
         """Testa notificação automática de prazo vencendo"""
         from notificacoes.models import Notificacao
         from unittest.mock import patch
@@ -756,15 +835,16 @@ class TestFluxoNotificacoes:
         # Simular task de verificação de prazos
         with patch('notificacoes.tasks.enviar_email_notificacao.delay') as mock_email:
             from notificacoes.services import verificar_prazos_vencimento
-            verificar_prazos_vencimento()
+            # Prazos, INSERT em lote das notificações e o fallback de existência
+            with django_assert_num_queries(3):
+                verificar_prazos_vencimento(prazo_ids=[prazo.id])
             
             # Verificar se notificação foi criada
-            notificacao = Notificacao.objects.filter(
+            notificacao = Notificacao.objects.get(
                 usuario=user,
                 tipo='prazo_vencimento'
-            ).first()
+            )
             
-            assert notificacao is not None
             assert str(prazo.id) in notificacao.conteudo
             mock_email.assert_called_once()
     
@@ -803,7 +883,7 @@ class TestFluxoRelatoriosAvancados:
     """Testa geração de relatórios avançados e dashboards"""
     
     @pytest.mark.django_db
-    def test_dashboard_metricas_tempo_real(self, authenticated_client):
+    def test_dashboard_metricas_tempo_real(self, authenticated_client, urls):
         """Testa dashboard com métricas em tempo real"""
         client = authenticated_client
         
@@ -820,10 +900,21 @@ class TestFluxoRelatoriosAvancados:
             )
         
         # Acessar dashboard
-        dashboard_url = reverse('core:dashboard')
-        response = client.get(dashboard_url)
+        dashboard_url = urls['core:dashboard']
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(dashboard_url)
         assert response.status_code == 200
         
+        # Contadores de processos vêm de um único aggregate com Count(filter=Q(...)),
+        # não de um .count() por métrica (os GROUP BY dos gráficos são à parte)
+        contagens_processos = [
+            q for q in ctx.captured_queries
+            if 'COUNT(' in q['sql'].upper()
+            and 'FROM "processos_processo"' in q['sql']
+            and 'GROUP BY' not in q['sql'].upper()
+        ]
+        assert len(contagens_processos) <= 1
+        
         context = response.context
         assert context['total_clientes'] == 10
         assert context['processos_ativos'] == 7
@@ -836,12 +927,13 @@ class TestFluxoRelatoriosAvancados:
         client = authenticated_client
         user = UserFactory()
         
-        # Criar processos atribuídos ao advogado
-        processos = ProcessoFactory.create_batch(5, responsavel=user)
-        
-        # Adicionar andamentos
-        for processo in processos:
-            AndamentoFactory.create_batch(3, processo=processo, usuario=user)
+        # Criar processos atribuídos ao advogado e 3 andamentos em cada
+        # (um bulk_create por modelo)
+        with transaction.atomic():
+            processos = ProcessoFactory.create_batch_bulk(5, usuario_responsavel=user)
+            AndamentoFactory.create_batch_bulk(
+                15, processo=factory.Iterator(processos), usuario=user
+            )
         
         # Gerar relatório
         relatorio_url = reverse('relatorios:produtividade_advogado', args=[user.id])
@@ -854,79 +946,115 @@ class TestFluxoRelatoriosAvancados:
         assert context['media_andamentos_processo'] == 3.0
     
     @pytest.mark.django_db
-    def test_exportacao_relatorio_excel(self, authenticated_client):
+    def test_exportacao_relatorio_excel(self, authenticated_client, urls, monkeypatch):
         """Testa exportação de relatório em Excel"""
         client = authenticated_client
         
         # Criar dados para exportação
-        ClienteFactory.create_batch(5)
+        ClienteFactory.create_batch_bulk(5)
+        
+        # Registrar como a view cria a planilha
+        workbooks = []
+        workbook_original = openpyxl.Workbook
+        
+        def registrar_workbook(*args, **kwargs):
+            workbooks.append(kwargs)
+            return workbook_original(*args, **kwargs)
+        
+        monkeypatch.setattr(openpyxl, 'Workbook', registrar_workbook)
         
         # Solicitar exportação
-        export_url = reverse('relatorios:clientes_excel')
+        export_url = urls['relatorios:clientes_excel']
         response = client.get(export_url)
         assert response.status_code == 200
         assert response['Content-Type'] == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         assert 'attachment' in response['Content-Disposition']
+        
+        # Planilha write-only, enviada em streaming e não num único bloco de bytes
+        assert workbooks == [{'write_only': True}]
+        assert isinstance(response, StreamingHttpResponse)
+        conteudo = b''.join(response.streaming_content)
+        
+        # E continua sendo um .xlsx válido, com o cabeçalho e uma linha por cliente
+        planilha = openpyxl.load_workbook(io.BytesIO(conteudo), read_only=True).active
+        linhas = list(planilha.values)
+        assert linhas[0] == ('Nome', 'Email')
+        assert len(linhas) == 6
+
+
+@pytest.fixture(scope='class')
+def perf_dataset(transacao_da_classe):
+    """Massa de dados de TestFluxoPerformanceCritico, criada uma vez por classe
+
+    Mesmo esquema de big_dataset: transação externa desfeita no teardown e
+    testes somente leitura, cada um no seu savepoint. O grupo próprio do
+    xdist monta a massa num único worker, em paralelo com a de big_dataset.
+    """
+    clientes = ClienteFactory.create_batch_bulk(100)
+    processos = ProcessoFactory.create_batch_bulk(
+        100, cliente=factory.Iterator(clientes)
+    )
+    # 3 andamentos e 2 prazos em cada um dos 20 primeiros processos
+    primeiros = processos[:20]
+    AndamentoFactory.create_batch_bulk(60, processo=factory.Iterator(primeiros))
+    PrazoFactory.create_batch_bulk(40, processo=factory.Iterator(primeiros))
+    yield {
+        'clientes': [c.pk for c in clientes],
+        'processos': [p.pk for p in processos],
+    }
 
 
 @pytest.mark.integration
 @pytest.mark.slow
+@pytest.mark.xdist_group(name='performance_critico')
 class TestFluxoPerformanceCritico:
     """Testa cenários críticos de performance"""
     
     @pytest.mark.django_db
-    def test_listagem_processos_otimizada(self, authenticated_client):
+    def test_listagem_processos_otimizada(self, authenticated_client, perf_dataset, urls):
         """Testa se listagem de processos está otimizada com select_related/prefetch_related"""
-        from django.test.utils import override_settings
-        from django.db import connection
-        
         client = authenticated_client
         
-        # Criar muitos dados relacionados
-        clientes = ClienteFactory.create_batch(20)
-        processos = []
-        for cliente in clientes:
-            processo = ProcessoFactory(cliente=cliente)
-            processos.append(processo)
-            AndamentoFactory.create_batch(3, processo=processo)
-            PrazoFactory.create_batch(2, processo=processo)
-        
         # Testar listagem com contagem de queries
-        with override_settings(DEBUG=True):
-            connection.queries_log.clear()
-            
-            list_url = reverse('processos:list')
+        list_url = urls['processos:list']
+        with CaptureQueriesContext(connection) as ctx:
             response = client.get(list_url)
-            
-            assert response.status_code == 200
-            # Deve usar no máximo 5 queries independente da quantidade de dados
-            assert len(connection.queries) <= 5
+        
+        assert response.status_code == 200
+        # Deve usar no máximo 5 queries independente da quantidade de dados
+        assert len(ctx.captured_queries) <= 5
+        
+        # Formato das consultas: com TEST_DISABLE_TEMPLATE_RENDER a resposta só
+        # conta as linhas, então o queryset da view é avaliado diretamente
+        view = ProcessoListView()
+        view.setup(RequestFactory().get(list_url))
+        with CaptureQueriesContext(connection) as ctx:
+            list(view.get_queryset())
+        sqls = [q['sql'] for q in ctx.captured_queries]
+        
+        # FK via select_related: JOIN na consulta principal
+        assert re.search(r'FROM "processos_processo" .*JOIN "clientes_cliente"', sqls[0])
+        # Relações reversas via prefetch_related: uma única consulta IN (...) cada
+        for tabela in ('processos_andamento', 'processos_prazo'):
+            consultas = [sql for sql in sqls if re.search(rf'FROM "{tabela}"', sql)]
+            assert len(consultas) == 1
+            assert re.search(r'IN \((?:[^,()]+, )+[^,()]+\)', consultas[0])
     
     @pytest.mark.django_db
-    def test_busca_global_performance(self, authenticated_client):
+    def test_busca_global_performance(self, authenticated_client, perf_dataset, urls):
         """Testa performance da busca global"""
-        import time
-        
         client = authenticated_client
         
-        # Criar muitos dados para busca
-        ClienteFactory.create_batch(100)
-        ProcessoFactory.create_batch(100)
-        
-        # Testar busca
-        start_time = time.time()
-        
-        search_url = reverse('core:busca_global')
-        response = client.get(search_url, {'q': 'Silva'})
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
+        # Testar busca: uma consulta por modelo pesquisado, independente do volume
+        search_url = urls['core:busca_global']
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(search_url, {'q': 'Silva'})
         
         assert response.status_code == 200
-        assert execution_time < 2.0  # Deve executar em menos de 2 segundos
+        assert len(ctx.captured_queries) <= BUSCA_GLOBAL_MAX_QUERIES
     
     @pytest.mark.django_db
-    def test_cache_dashboard_funcionando(self, authenticated_client):
+    def test_cache_dashboard_funcionando(self, authenticated_client, urls):
         """Testa se cache do dashboard está funcionando corretamente"""
         from django.core.cache import cache
         
@@ -935,15 +1063,32 @@ class TestFluxoPerformanceCritico:
         # Limpar cache
         cache.clear()
         
-        # Primeira requisição - deve calcular
-        dashboard_url = reverse('core:dashboard')
+        # Primeira requisição - deve calcular e popular o cache
+        dashboard_url = urls['core:dashboard']
         response1 = client.get(dashboard_url)
+        assert response1.status_code == 200
+        metricas = cache.get('dashboard_metrics')
+        assert metricas is not None
+        
+        # Em produção o cache usa o JSONSerializer do django_redis: o conteúdo
+        # precisa sobreviver à ida e volta sem perder nada
+        serializer = JSONSerializer(options={})
+        assert serializer.loads(serializer.dumps(metricas)) == metricas
         
         # Segunda requisição - deve vir do cache
-        response2 = client.get(dashboard_url)
+        with CaptureQueriesContext(connection) as ctx:
+            response2 = client.get(dashboard_url)
         
-        assert response1.status_code == 200
         assert response2.status_code == 200
+        # Só o usuário da sessão e as duas listas (fora do cache) são lidos;
+        # nenhuma contagem ou soma é recalculada
+        assert len(ctx.captured_queries) <= DASHBOARD_CACHE_HIT_MAX_QUERIES
+        assert not [
+            q for q in ctx.captured_queries
+            if 'clientes_cliente' in q['sql']
+            or 'FROM "processos_processo"' in q['sql']
+            or re.search(r'\b(COUNT|SUM)\(', q['sql'], re.IGNORECASE)
+        ]
         
         # Verificar se dados estão no cache
         cached_data = cache.get('dashboard_metrics')
@@ -955,7 +1100,7 @@ class TestFluxoSeguranca:
     """Testa aspectos de segurança integrados"""
     
     @pytest.mark.django_db
-    def test_controle_acesso_por_permissao(self, client):
+    def test_controle_acesso_por_permissao(self, client, urls):
         """Testa controle de acesso baseado em permissões"""
         from django.contrib.auth.models import Permission
         
@@ -964,7 +1109,7 @@ class TestFluxoSeguranca:
         client.force_login(user_sem_permissao)
         
         # Tentar acessar área restrita
-        admin_url = reverse('admin:index')
+        admin_url = urls['admin:index']
         response = client.get(admin_url)
         assert response.status_code in [302, 403]  # Redirect ou forbidden
         
@@ -1008,13 +1153,13 @@ class TestFluxoSeguranca:
         assert 'nome_razao_social' in log.campos_alterados
     
     @pytest.mark.django_db
-    def test_validacao_csrf_protecao(self, client):
+    def test_validacao_csrf_protecao(self, client, urls):
         """Testa se proteção CSRF está funcionando"""
         user = UserFactory()
         client.force_login(user)
         
         # Tentar POST sem token CSRF
-        create_url = reverse('clientes:criar')
+        create_url = urls['clientes:criar']
         response = client.post(create_url, {
             'nome_razao_social': 'Teste CSRF',
             'tipo_pessoa': 'PF',
@@ -202,11 +202,12 @@ class TestDocumentoModel:
 class TestProcessoViews(TestCase):
     """Testes para views de processos"""
     
-    def setUp(self):
-        """Configuração inicial dos testes"""
-        self.user = UserFactory()
-        self.cliente = ClienteFactory()
-        self.processo = ProcessoFactory(cliente=self.cliente)
+    @classmethod
+    def setUpTestData(cls):
+        """Dados compartilhados pela classe (revertidos por savepoint a cada teste)"""
+        cls.user = UserFactory()
+        cls.cliente = ClienteFactory()
+        cls.processo = ProcessoFactory(cliente=cls.cliente)
     
     def test_lista_processos_requer_login(self):
         """Testa que listagem requer autenticação"""
@@ -327,11 +328,12 @@ class TestProcessoViews(TestCase):
 class TestAndamentoViews(TestCase):
     """Testes para views de andamentos"""
     
-    def setUp(self):
-        """Configuração inicial dos testes"""
-        self.user = UserFactory()
-        self.processo = ProcessoFactory()
-        self.andamento = AndamentoFactory(processo=self.processo)
+    @classmethod
+    def setUpTestData(cls):
+        """Dados compartilhados pela classe (revertidos por savepoint a cada teste)"""
+        cls.user = UserFactory()
+        cls.processo = ProcessoFactory()
+        cls.andamento = AndamentoFactory(processo=cls.processo)
     
     def test_lista_andamentos(self):
         """Testa listagem de andamentos"""
@@ -367,11 +369,12 @@ class TestAndamentoViews(TestCase):
 class TestPrazoViews(TestCase):
     """Testes para views de prazos"""
     
-    def setUp(self):
-        """Configuração inicial dos testes"""
-        self.user = UserFactory()
-        self.processo = ProcessoFactory()
-        self.prazo = PrazoFactory(processo=self.processo)
+    @classmethod
+    def setUpTestData(cls):
+        """Dados compartilhados pela classe (revertidos por savepoint a cada teste)"""
+        cls.user = UserFactory()
+        cls.processo = ProcessoFactory()
+        cls.prazo = PrazoFactory(processo=cls.processo)
     
     def test_lista_prazos(self):
         """Testa listagem de prazos"""
@@ -460,10 +463,11 @@ class TestPrazoViews(TestCase):
 class TestProcessoAPI(APITestCase):
     """Testes para API de processos"""
     
-    def setUp(self):
-        """Configuração inicial dos testes de API"""
-        self.user = UserFactory()
-        self.processo = ProcessoFactory()
+    @classmethod
+    def setUpTestData(cls):
+        """Dados compartilhados pela classe (revertidos por savepoint a cada teste)"""
+        cls.user = UserFactory()
+        cls.processo = ProcessoFactory()
     
     def test_lista_processos_api_sem_auth(self):
         """Testa API sem autenticação"""
@@ -616,7 +620,7 @@ class TestProcessoPerformance:
     @pytest.mark.django_db
     def test_queries_otimizadas_detalhes(self, authenticated_client):
         """Testa queries otimizadas na página de detalhes"""
-        from django.test.utils import override_settings
+        from django.test.utils import CaptureQueriesContext
         from django.db import connection
         
         processo = ProcessoFactory()
@@ -624,12 +628,10 @@ class TestProcessoPerformance:
         PrazoFactory.create_batch(3, processo=processo)
         DocumentoFactory.create_batch(2, processo=processo)
         
-        with override_settings(DEBUG=True):
-            connection.queries_log.clear()
-            
-            url = reverse('processos:detalhe', kwargs={'pk': processo.pk})
+        url = reverse('processos:detalhe', kwargs={'pk': processo.pk})
+        with CaptureQueriesContext(connection) as ctx:
             response = authenticated_client.get(url)
-            
-            assert response.status_code == 200
-            # Deve usar poucas queries devido às otimizações
-            assert len(connection.queries) < 15
\ No newline at end of file
+        
+        assert response.status_code == 200
+        # Deve usar poucas queries devido às otimizações
+        assert len(ctx.captured_queries) < 15
\ No newline at end of file